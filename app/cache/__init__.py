@@ -0,0 +1,4 @@
+from .backends import BackendName, create_backend
+from .base import CacheBackend, GenerationalCache
+from .memory import LRUCache, MemoryBackend
+from .sqlite import SQLiteBackend
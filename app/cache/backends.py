@@ -0,0 +1,22 @@
+from typing import Literal, Optional
+
+from app.cache.base import CacheBackend
+from app.cache.memory import MemoryBackend
+from app.cache.sqlite import SQLiteBackend
+
+
+BackendName = Literal["memory", "sqlite"]
+
+
+def create_backend(
+    name: BackendName,
+    maxsize: int = 1024,
+    ttl: Optional[float] = None,
+    path: Optional[str] = None,
+) -> CacheBackend:
+    """Builds a cache backend by its name."""
+
+    if name == "sqlite":
+        return SQLiteBackend(path=path, maxsize=maxsize, ttl=ttl)
+
+    return MemoryBackend(maxsize=maxsize, ttl=ttl)
@@ -0,0 +1,95 @@
+import hashlib
+from abc import ABC, abstractmethod
+from typing import Any, Optional
+
+
+class CacheBackend(ABC):
+    """Interface of storages for cache entries & counters."""
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[bytes]:
+        ...
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl: Optional[float] = None):
+        ...
+
+    @abstractmethod
+    async def counter(self, key: str) -> Optional[int]:
+        ...
+
+    @abstractmethod
+    async def incr(self, key: str) -> Optional[int]:
+        ...
+
+    @abstractmethod
+    async def clear(self):
+        ...
+
+    @abstractmethod
+    async def stats(self) -> dict:
+        ...
+
+
+class GenerationalCache:
+    """Cache of a namespace whose entries are dropped by a generation bump.
+
+    Keys embed the current generation, so bumping it makes every previous
+    entry unreachable at once and stale ones just expire in the backend.
+    A key has to be taken before reading the source of the cached value,
+    otherwise a value read before a write may be stored past its bump.
+    There is no key (and so no caching) while the generation is unknown.
+    """
+
+    def __init__(self, backend: CacheBackend, namespace: str):
+        self.backend = backend
+        self.namespace = namespace
+
+        self.hits = 0
+        self.misses = 0
+
+    async def key(self, *parts: Any) -> Optional[str]:
+        generation = await self.backend.counter(self.namespace)
+        if generation is None:
+            return None
+
+        digest = hashlib.blake2b(
+            repr(parts).encode(),
+            digest_size=16,
+        ).hexdigest()
+
+        return f"{self.namespace}:{generation}:{digest}"
+
+    async def get(self, key: Optional[str]) -> Optional[bytes]:
+        if key is None:
+            return None
+
+        value = await self.backend.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+
+        return value
+
+    async def set(
+        self,
+        key: Optional[str],
+        value: bytes,
+        ttl: Optional[float] = None,
+    ):
+        if key is not None:
+            await self.backend.set(key, value, ttl=ttl)
+
+    async def bump(self) -> Optional[int]:
+        return await self.backend.incr(self.namespace)
+
+    async def clear(self):
+        await self.backend.clear()
+
+    async def stats(self) -> dict:
+        return {
+            **await self.backend.stats(),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
@@ -0,0 +1,134 @@
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+from app.cache.base import CacheBackend
+
+
+class LRUCache:
+    """Bounded in-process cache with LRU eviction and TTL expiration.
+
+    A value read from its source may be stored with a `token()` taken
+    before the read, it isn't stored if the key has been deleted since.
+    Deletions are remembered for `maxsize` keys, older ones make every
+    value read before them not stored.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+
+        self._items: OrderedDict[
+            Hashable, tuple[Optional[float], Any]
+        ] = OrderedDict()
+
+        self._clock = 0
+        self._floor = 0
+        self._deleted: OrderedDict[Hashable, int] = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        item = self._items.get(key)
+        if item is None:
+            self.misses += 1
+            return default
+
+        expires_at, value = item
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._items[key]
+            self.misses += 1
+            return default
+
+        self._items.move_to_end(key)
+        self.hits += 1
+
+        return value
+
+    def token(self) -> int:
+        return self._clock
+
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        ttl: Optional[float] = None,
+        token: Optional[int] = None,
+    ):
+        if token is not None and (
+            token < self._floor or self._deleted.get(key, 0) > token
+        ):
+            return
+
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = None if ttl is None else time.monotonic() + ttl
+
+        self._items[key] = (expires_at, value)
+        self._items.move_to_end(key)
+
+        while len(self._items) > self.maxsize:
+            self._items.popitem(last=False)
+            self.evictions += 1
+
+    def delete(self, *keys: Hashable):
+        for key in keys:
+            self._items.pop(key, None)
+
+            self._clock += 1
+            self._deleted[key] = self._clock
+            self._deleted.move_to_end(key)
+
+        while len(self._deleted) > self.maxsize:
+            _, self._floor = self._deleted.popitem(last=False)
+
+    def clear(self):
+        self._items.clear()
+
+        self._clock += 1
+        self._floor = self._clock
+        self._deleted.clear()
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._items),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+class MemoryBackend(CacheBackend):
+    """Cache backend keeping entries in the process memory."""
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None):
+        self.entries = LRUCache(maxsize=maxsize, ttl=ttl)
+        # Counters aren't evictable, a lost generation would resurrect
+        # entries stored under it.
+        self.counters: dict[str, int] = {}
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return self.entries.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: Optional[float] = None):
+        self.entries.set(key, value, ttl=ttl)
+
+    async def counter(self, key: str) -> int:
+        return self.counters.get(key, 0)
+
+    async def incr(self, key: str) -> int:
+        self.counters[key] = self.counters.get(key, 0) + 1
+        return self.counters[key]
+
+    async def clear(self):
+        self.entries.clear()
+        self.counters.clear()
+
+    async def stats(self) -> dict:
+        return self.entries.stats()
@@ -0,0 +1,182 @@
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Optional
+
+from app.cache.base import CacheBackend
+
+
+logger = logging.getLogger(__name__)
+
+
+class SQLiteBackend(CacheBackend):
+    """Cache backend shared by the processes of a host via a SQLite file.
+
+    Statements run in a thread, one at a time as they share a connection,
+    so waiting for a lock held by another process never blocks the event
+    loop. Any storage error is logged and treated as a miss: the cache is
+    never a reason for a request to fail.
+    """
+
+    # Expired & surplus entries are purged every `purge_every` writes
+    purge_every = 128
+
+    def __init__(
+        self,
+        path: str,
+        maxsize: int = 1024,
+        ttl: Optional[float] = None,
+    ):
+        self.path = path
+        self.maxsize = maxsize
+        self.ttl = ttl
+
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._writes = 0
+
+        self.evictions = 0
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        if self._connection is None:
+            connection = sqlite3.connect(
+                self.path,
+                timeout=1.0,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=OFF")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, "
+                "value BLOB NOT NULL, "
+                "expires_at REAL)"
+            )
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS counters ("
+                "key TEXT PRIMARY KEY, "
+                "value INTEGER NOT NULL)"
+            )
+            self._connection = connection
+
+        return self._connection
+
+    def _locked(self, fn: Callable[..., Any], *args) -> Any:
+        with self._lock:
+            return fn(*args)
+
+    async def _run(self, fn: Callable[..., Any], *args) -> Any:
+        return await asyncio.to_thread(self._locked, fn, *args)
+
+    def _get(self, key: str) -> Optional[bytes]:
+        row = self.connection.execute(
+            "SELECT value FROM entries "
+            "WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)",
+            (key, time.time()),
+        ).fetchone()
+
+        return None if row is None else row[0]
+
+    async def get(self, key: str) -> Optional[bytes]:
+        try:
+            return await self._run(self._get, key)
+        except sqlite3.Error as e:
+            logger.warning("Cache entry %s can't be read: %s", key, e)
+            return None
+
+    def _set(self, key: str, value: bytes, expires_at: Optional[float]):
+        self.connection.execute(
+            "INSERT OR REPLACE INTO entries (key, value, expires_at) "
+            "VALUES (?, ?, ?)",
+            (key, value, expires_at),
+        )
+
+        self._writes += 1
+        if self._writes % self.purge_every == 0:
+            self._purge()
+
+    async def set(self, key: str, value: bytes, ttl: Optional[float] = None):
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = None if ttl is None else time.time() + ttl
+
+        try:
+            await self._run(self._set, key, value, expires_at)
+        except sqlite3.Error as e:
+            logger.warning("Cache entry %s can't be written: %s", key, e)
+
+    def _purge(self):
+        self.connection.execute(
+            "DELETE FROM entries WHERE expires_at <= ?",
+            (time.time(),),
+        )
+        # Entries expiring first go first, ones without a TTL go last
+        cursor = self.connection.execute(
+            "DELETE FROM entries WHERE key IN ("
+            "SELECT key FROM entries ORDER BY expires_at DESC NULLS FIRST "
+            "LIMIT -1 OFFSET ?)",
+            (self.maxsize,),
+        )
+        self.evictions += max(cursor.rowcount, 0)
+
+    def _counter(self, key: str) -> int:
+        row = self.connection.execute(
+            "SELECT value FROM counters WHERE key = ?",
+            (key,),
+        ).fetchone()
+
+        return 0 if row is None else row[0]
+
+    async def counter(self, key: str) -> Optional[int]:
+        try:
+            return await self._run(self._counter, key)
+        except sqlite3.Error as e:
+            logger.warning("Cache counter %s can't be read: %s", key, e)
+            return None
+
+    def _incr(self, key: str) -> int:
+        return self.connection.execute(
+            "INSERT INTO counters (key, value) VALUES (?, 1) "
+            "ON CONFLICT (key) DO UPDATE SET value = value + 1 "
+            "RETURNING value",
+            (key,),
+        ).fetchone()[0]
+
+    async def incr(self, key: str) -> Optional[int]:
+        try:
+            return await self._run(self._incr, key)
+        except sqlite3.Error as e:
+            logger.error("Cache counter %s can't be bumped: %s", key, e)
+            return None
+
+    def _clear(self):
+        with self.connection:
+            self.connection.execute("BEGIN IMMEDIATE")
+            self.connection.execute("DELETE FROM entries")
+            self.connection.execute("DELETE FROM counters")
+
+        self.evictions = 0
+
+    async def clear(self):
+        await self._run(self._clear)
+
+    def _size(self) -> int:
+        return self.connection.execute(
+            "SELECT count(*) FROM entries",
+        ).fetchone()[0]
+
+    async def stats(self) -> dict:
+        try:
+            size = await self._run(self._size)
+        except sqlite3.Error:
+            size = -1
+
+        return {
+            "size": size,
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "evictions": self.evictions,
+        }
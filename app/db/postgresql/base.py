@@ -1,8 +1,18 @@
-from sqlalchemy import MetaData
+import asyncio
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, AsyncIterator, Awaitable, Callable, Optional
+
+from sqlalchemy import MetaData, event, text
 from sqlalchemy.ext import asyncio as sa_async
 from sqlalchemy.orm import declarative_base, sessionmaker
 
 from app.config import config
+from app.db.postgresql.pool import InstrumentedPool
+from app.db.postgresql.replicas import ReplicaSet
+
+
+if TYPE_CHECKING:
+    from app.config.base import PostgreSQL
 
 
 METADATA = MetaData(
@@ -20,18 +30,135 @@ METADATA = MetaData(
 )
 
 
-engine: sa_async.AsyncEngine = sa_async.create_async_engine(
-    url=config.postgresql.using_async_driver,
-    echo=config.app.debug,
-    future=True,
-)
+class Database:
+    """Engines & the session factory of the app, created on first use.
+
+    The app opens them at startup (so importing the app connects nowhere)
+    and disposes of them at shutdown, scripts may just use them.
+    """
+
+    def __init__(
+        self,
+        settings: "PostgreSQL",
+        echo: bool = False,
+        workers: int = 1,
+    ):
+        self.settings = settings
+        self.echo = echo
+        self.workers = workers
+
+        self._engine: Optional[sa_async.AsyncEngine] = None
+        self._session_factory: Optional[sessionmaker] = None
+        self._replicas: Optional[ReplicaSet] = None
+
+    @property
+    def engine(self) -> sa_async.AsyncEngine:
+        if self._engine is None:
+            self._engine = sa_async.create_async_engine(
+                url=self.settings.using_async_driver,
+                echo=self.echo,
+                future=True,
+                poolclass=InstrumentedPool,
+                **self.settings.engine_options(workers=self.workers),
+            )
+
+        return self._engine
+
+    @property
+    def SessionFactory(self) -> sessionmaker:
+        if self._session_factory is None:
+            self._session_factory = sessionmaker(
+                bind=self.engine,
+                autocommit=False,
+                autoflush=False,
+                expire_on_commit=False,
+                class_=sa_async.AsyncSession,
+            )
+
+        return self._session_factory
+
+    @property
+    def replicas(self) -> ReplicaSet:
+        if self._replicas is None:
+            self._replicas = ReplicaSet(
+                dsns=self.settings.using_async_driver_for_replicas,
+                check_interval=self.settings.replica_check_interval,
+                check_timeout=self.settings.replica_check_timeout,
+                **self.settings.engine_options(workers=self.workers),
+            )
+
+        return self._replicas
+
+    def session(self) -> sa_async.AsyncSession:
+        return self.SessionFactory()
+
+    @asynccontextmanager
+    async def read_session(self) -> AsyncIterator[sa_async.AsyncSession]:
+        """Session of a healthy replica, the primary one is the fallback."""
+
+        replica = None
+        if self.replicas:
+            replica = await self.replicas.choose()
 
-SessionFactory = sessionmaker(
-    bind=engine,
-    autocommit=False,
-    autoflush=False,
-    expire_on_commit=False,
-    class_=sa_async.AsyncSession,
+        factory = self.SessionFactory
+        if replica is not None:
+            factory = replica.SessionFactory
+
+        async with factory() as session:
+            yield session
+
+    def open(self):
+        """Creates the engines & the session factory unless they exist."""
+
+        # They're created on the first access
+        _ = self.SessionFactory, self.replicas
+
+    async def warm(
+        self,
+        connections: int,
+        warmer: Optional[
+            Callable[[sa_async.AsyncSession], Awaitable[None]]
+        ] = None,
+    ):
+        """Opens pool connections ahead of the first requests.
+
+        Connections are checked out at once, so each one is a new one
+        (no more than the pool keeps), and `warmer` runs its statements
+        on each of them to have them compiled & prepared.
+        """
+
+        connections = min(connections, self.engine.pool.size())
+
+        async def warm_one():
+            async with self.session() as session:
+                await session.connection()
+                if warmer is not None:
+                    await warmer(session)
+
+        await asyncio.gather(*(warm_one() for _ in range(connections)))
+
+    async def dispose(self):
+        if self._engine is not None:
+            await self._engine.dispose()
+        if self._replicas is not None:
+            await self._replicas.dispose()
+
+        self._engine = self._session_factory = self._replicas = None
+
+
+database = Database(
+    settings=config.postgresql,
+    echo=config.app.debug,
+    workers=config.app.workers,
 )
 
 Base = declarative_base(metadata=METADATA)
+
+EXTENSIONS = ("pg_trgm",)
+
+
+# |Events|
+@event.listens_for(METADATA, "before_create")
+def _create_extensions(metadata, conn, **kwargs):  # noqa: keep parameters
+    for extension in EXTENSIONS:
+        conn.execute(text(f"CREATE EXTENSION IF NOT EXISTS {extension}"))
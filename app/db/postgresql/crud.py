@@ -1,10 +1,50 @@
-from typing import Generic, Optional, Sequence, Type, TypeVar
+import json
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Generic,
+    Mapping,
+    Optional,
+    Sequence,
+    Type,
+    TypeVar,
+)
 from uuid import UUID
 
-from sqlalchemy import TextClause, func, inspect, select, update
+from sqlalchemy import (
+    any_,
+    delete,
+    func,
+    insert,
+    inspect,
+    literal,
+    select,
+    text,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.postgresql.base import Base
+from app.db.postgresql.decorators import operation
+from app.db.postgresql.statements import labelled
+from app.db.postgresql.utils import (
+    Explain,
+    decode_cursor,
+    encode_cursor,
+    restore_value,
+)
+from app.types.search import CountModeType
+
+
+if TYPE_CHECKING:
+    from sqlalchemy import Column, ColumnElement, RowMapping
+    from sqlalchemy.orm import InstrumentedAttribute
+
+    from app.utils.schemas import OrderByField
 
 
 Table = TypeVar("Table", bound=Base)
@@ -15,57 +55,234 @@ class CRUD(Generic[Table]):
 
     table: Type[Table]
 
+    # Fields clients may sort by, mapped to the index supporting each
+    orderable: dict[str, str] = {}
+
     def __init__(self, session: AsyncSession):
         self.session = session
 
+    @property
+    def primary_key(self) -> "Column":
+        return inspect(self.table).primary_key[0]
+
+    @operation
     async def get(self, id_: UUID | str) -> Optional[Table]:
         return await self.session.get(self.table, id_)
 
+    @property
+    def primary_attribute(self) -> "InstrumentedAttribute":
+        # Statements filtered by the mapped attribute (not the column)
+        # keep instances already present in the session in sync.
+        return getattr(self.table, self.primary_key.key)
+
+    def columns(self, *fields: str) -> list["Column"]:
+        """Returns columns of the fields, all of the table ones if none."""
+
+        columns = inspect(self.table).columns
+        if not fields:
+            return list(columns)
+
+        return [columns[field] for field in fields]
+
+    @property
+    def onupdate(self) -> dict:
+        """Returns SQL expressions of server side `ON UPDATE` defaults."""
+
+        return {
+            column.key: column.server_onupdate.arg
+            for column in inspect(self.table).columns
+            if getattr(column.server_onupdate, "arg", None) is not None
+        }
+
+    @operation
     async def insert(self, data: dict, **kwargs) -> Table:
-        instance = self.table(**data, **kwargs)
+        """Inserts a record, server defaults come back via `RETURNING`."""
 
-        self.session.add(instance=instance)
-        await self.session.flush()
-        await self.session.refresh(instance=instance)
+        statement = (
+            insert(self.table).values(**data, **kwargs).returning(self.table)
+        )
+
+        return await self.session.scalar(statement=statement)
 
-        return instance
+    @operation
+    async def insert_many(self, data: Sequence[dict]) -> Sequence[Table]:
+        """Inserts records with one multi-row statement.
+
+        Rows violating a unique constraint are skipped, only the inserted
+        ones are returned.
+        """
+
+        if not data:
+            return []
+
+        statement = (
+            pg_insert(self.table)
+            .values(list(data))
+            .on_conflict_do_nothing()
+            .returning(self.table)
+        )
+        results = await self.session.scalars(statement=statement)
+
+        return results.all()
+
+    @operation
+    async def copy(
+        self,
+        records: Sequence[tuple],
+        columns: Sequence[str],
+    ) -> int:
+        """Loads records with binary COPY, skipping conflicting ones.
+
+        Records are copied into a temporary staging table first and moved
+        from there with `ON CONFLICT DO NOTHING`, so the number of inserted
+        records is returned.
+        """
+
+        if not records:
+            return 0
+
+        table = self.table.__tablename__
+        staging = f"{table}__staging"
+        names = ", ".join(columns)
+
+        # The statement goes through the session to open its transaction,
+        # the COPY then runs within it on the very same connection.
+        await self.session.execute(
+            text(
+                f"CREATE TEMP TABLE IF NOT EXISTS {staging} "
+                f"(LIKE {table} INCLUDING DEFAULTS) ON COMMIT DROP",
+            ),
+        )
 
+        connection = await self.session.connection()
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            staging,
+            records=records,
+            columns=list(columns),
+        )
+
+        # Staged records are deleted as they're merged, the table is left
+        # empty for the next call within the same transaction.
+        result = await self.session.execute(
+            text(
+                f"WITH staged AS (DELETE FROM {staging} RETURNING {names}) "
+                f"INSERT INTO {table} ({names}) "
+                f"SELECT {names} FROM staged ON CONFLICT DO NOTHING",
+            ),
+        )
+
+        return result.rowcount
+
+    @operation
     async def select(
         self,
         *filters,
-        order_by: Optional[list["TextClause"]] = None,
+        order_by: Optional[list["ColumnElement"]] = None,
         offset: int = 0,
         limit: int = 10,
         one_or_none: bool = False,
-    ) -> Sequence[Table] | Optional[Table]:
-        statement = select(self.table).where(*filters)
+        columns: Optional[Sequence["Column"]] = None,
+    ) -> Sequence[Table | "RowMapping"] | Optional[Table | "RowMapping"]:
+        """Selects records, as mappings of the `columns` if they're given.
+
+        Mappings are plain Core rows, they skip the identity map and the
+        ORM instrumentation altogether.
+        """
+
+        statement = select(*columns) if columns else select(self.table)
+        statement = statement.where(*filters)
 
         if order_by:
             statement = statement.order_by(*order_by)
 
         statement = statement.offset(offset=offset).limit(limit=limit)
-        results = await self.session.scalars(statement=statement)
+        if columns:
+            results = await self.session.execute(statement=statement)
+            results = results.mappings()
+        else:
+            results = await self.session.scalars(statement=statement)
 
         if one_or_none:
             return results.one_or_none()
         else:
             return results.all()
 
-    async def update(self, id_: UUID | str, data: dict) -> Optional[Table]:
-        instance = await self.get(id_=id_)
-        if instance is None:
-            return None
+    async def stream(
+        self,
+        *filters,
+        order_by: Optional[list["ColumnElement"]] = None,
+        yield_per: int = 1000,
+    ) -> AsyncIterator[Sequence["RowMapping"]]:
+        """Streams records as mappings from a server side cursor.
 
-        for k, v in data.items():
-            setattr(instance, k, v)
+        Rows are fetched & yielded by `yield_per`, ORM instances are not
+        built at all.
+        """
 
-        self.session.add(instance=instance)
+        statement = select(*inspect(self.table).columns).where(*filters)
 
-        await self.session.flush()
-        await self.session.refresh(instance=instance)
+        if order_by:
+            statement = statement.order_by(*order_by)
+
+        # A generator can't hold the label between its steps
+        with labelled("stream"):
+            results = await self.session.stream(
+                statement=statement.execution_options(yield_per=yield_per),
+            )
+        async for partition in results.mappings().partitions():
+            yield partition
+
+    @operation
+    async def select_scalar(self, column: "ColumnElement", *filters) -> Any:
+        """Selects a single value of a record instead of the whole one."""
+
+        statement = select(column).where(*filters)
+
+        return await self.session.scalar(statement=statement)
+
+    @operation
+    async def select_many(
+        self,
+        ids: Sequence[UUID | str],
+        *filters,
+    ) -> Sequence[Table]:
+        """Selects records by primary keys with a single `= ANY` query."""
 
-        return instance
+        if not ids:
+            return []
 
+        ids_ = literal(list(ids), ARRAY(self.primary_key.type))
+        statement = select(self.table).where(
+            self.primary_key == any_(ids_),
+            *filters,
+        )
+        results = await self.session.scalars(statement=statement)
+
+        return results.all()
+
+    @operation
+    async def update(
+        self,
+        id_: UUID | str,
+        data: dict,
+        *filters,
+    ) -> Optional[Table]:
+        """Updates a record by primary key with a single statement."""
+
+        statement = (
+            update(self.table)
+            .where(self.primary_attribute == id_, *filters)
+            .values({**self.onupdate, **data})
+            .returning(self.table)
+        )
+
+        return await self.session.scalar(
+            statement=statement,
+            execution_options={"populate_existing": True},
+        )
+
+    @operation
     async def update_many(self, *filters, data: dict) -> bool:
         statement = update(self.table).where(*filters).values(data)
         await self.session.execute(statement=statement)
@@ -73,20 +290,25 @@ class CRUD(Generic[Table]):
 
         return True
 
-    async def delete(self, id_: UUID | str) -> Optional[bool]:
-        instance = await self.get(id_=id_)
-        if instance is None:
-            return None
+    @operation
+    async def delete(self, id_: UUID | str, *filters) -> Optional[bool]:
+        """Deletes a record by primary key with a single statement."""
 
-        await self.session.delete(instance=instance)
-        await self.session.flush()
+        statement = (
+            delete(self.table)
+            .where(self.primary_attribute == id_, *filters)
+            .returning(self.primary_attribute)
+        )
+        if await self.session.scalar(statement=statement) is None:
+            return None
 
         return True
 
+    @operation
     async def count(
         self,
         *filters,
-        order_by: Optional[list["TextClause"]] = None,
+        order_by: Optional[list["ColumnElement"]] = None,
     ) -> int:
         statement = select(
             func.count(inspect(self.table).primary_key[0]),
@@ -97,19 +319,188 @@ class CRUD(Generic[Table]):
 
         return await self.session.scalar(statement=statement)
 
+    @operation
+    async def estimate(self, *filters) -> int:
+        """Returns the planner estimation of records count."""
+
+        if not filters:
+            statement = text(
+                "SELECT reltuples::bigint FROM pg_class "
+                "WHERE oid = CAST(:table AS regclass)",
+            )
+            reltuples = await self.session.scalar(
+                statement=statement,
+                params={"table": self.table.__tablename__},
+            )
+            # The table has never been analysed if it's negative
+            if reltuples is not None and reltuples >= 0:
+                return reltuples
+
+        statement = select(self.primary_key).where(*filters)
+        plan = await self.session.scalar(statement=Explain(statement))
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+
+        return plan[0]["Plan"]["Plan Rows"]
+
+    @operation
     async def select_with_count(
         self,
         *filters,
-        order_by: Optional[list["TextClause"]] = None,
+        order_by: Optional[list["ColumnElement"]] = None,
         offset: int = 0,
         limit: int = 10,
-    ) -> tuple[int, Optional[Sequence[Table]]]:
-        return (
-            await self.count(*filters),
-            await self.select(
-                *filters,
-                order_by=order_by,
-                offset=offset,
-                limit=limit,
-            ),
+        seek: Optional["ColumnElement"] = None,
+        count_mode: CountModeType = CountModeType.EXACT,
+        columns: Optional[Sequence["Column"]] = None,
+    ) -> tuple[Optional[int], Sequence[Table | "RowMapping"]]:
+        """Selects a page of records along with their count.
+
+        Records come as mappings of the `columns` if they're given, in the
+        exact count mode those carry the `total` column as well.
+        """
+
+        seek_filters = [] if seek is None else [seek]
+        statement = select(*columns) if columns else select(self.table)
+        statement = statement.where(*filters, *seek_filters)
+
+        if count_mode == CountModeType.EXACT:
+            # The total comes along with the page rows, a window is enough
+            # unless the page is narrowed down by the seek filter.
+            if seek is None:
+                total = func.count().over()
+            else:
+                total = (
+                    select(func.count())
+                    .select_from(self.table)
+                    .where(*filters)
+                    .scalar_subquery()
+                )
+
+            statement = statement.add_columns(total.label("total"))
+
+        if order_by:
+            statement = statement.order_by(*order_by)
+
+        statement = statement.offset(offset=offset).limit(limit=limit)
+        results = await self.session.execute(statement=statement)
+
+        if count_mode == CountModeType.EXACT:
+            rows = results.all()
+            if columns:
+                items = [row._mapping for row in rows]
+            else:
+                items = [row[0] for row in rows]
+
+            if rows:
+                count = rows[0].total
+            elif offset or seek is not None:
+                count = await self.count(*filters)
+            else:
+                count = 0
+        else:
+            if columns:
+                items = results.mappings().all()
+            else:
+                items = results.scalars().all()
+            count = None
+
+            if count_mode == CountModeType.ESTIMATED:
+                count = await self.estimate(*filters)
+
+        return count, items
+
+    def order_by(
+        self,
+        fields: Sequence["OrderByField"],
+    ) -> list["ColumnElement"]:
+        """Resolves ordering against the columns allowed to sort by."""
+
+        columns = inspect(self.table).columns
+        items = []
+
+        for item in fields:
+            if item.field not in self.orderable:
+                raise ValueError(
+                    f"The field {item.field} can't be used for ordering!",
+                )
+
+            column = columns[item.field]
+            items.append(column.desc() if item.desc else column.asc())
+
+        return items
+
+    # |Keyset pagination|
+    def seek_column(self, field: str) -> Optional["Column"]:
+        """Returns the column usable as keyset sort key if there is one."""
+
+        column = inspect(self.table).columns.get(field)
+        if column is None or column.nullable:
+            return None
+
+        return column
+
+    def seek_order_by(
+        self,
+        field: str,
+        desc: bool = True,
+    ) -> Optional[list["ColumnElement"]]:
+        """Builds keyset ordering with the primary key as a tiebreaker."""
+
+        column = self.seek_column(field)
+        if column is None:
+            return None
+
+        columns = [column]
+        if column is not self.primary_key:
+            columns.append(self.primary_key)
+
+        return [c.desc() if desc else c.asc() for c in columns]
+
+    def seek(
+        self,
+        cursor: str,
+        field: str,
+        desc: bool = True,
+    ) -> "ColumnElement":
+        """Builds the filter to continue right after the cursor position."""
+
+        cursor_field, cursor_desc, value, id_ = decode_cursor(cursor)
+        if (cursor_field, cursor_desc) != (field, desc):
+            raise ValueError("The cursor doesn't match the ordering!")
+
+        column = self.seek_column(field)
+        if column is None:
+            raise ValueError(f"The field {field} can't be used as a cursor!")
+
+        keys, position = [column], [restore_value(column, value)]
+        if column is not self.primary_key:
+            keys.append(self.primary_key)
+            position.append(restore_value(self.primary_key, id_))
+
+        if desc:
+            return tuple_(*keys) < tuple(position)
+        else:
+            return tuple_(*keys) > tuple(position)
+
+    def cursor(
+        self,
+        instance: Table | Mapping,
+        field: str,
+        desc: bool = True,
+    ) -> Optional[str]:
+        """Encodes the keyset position of the instance or row as a cursor."""
+
+        if self.seek_column(field) is None:
+            return None
+
+        key = self.primary_key.key
+        if isinstance(instance, Mapping):
+            return encode_cursor(field, desc, instance[field], instance[key])
+
+        return encode_cursor(
+            field,
+            desc,
+            getattr(instance, field),
+            getattr(instance, key),
         )
@@ -1,9 +1,25 @@
 from functools import wraps
 from typing import TYPE_CHECKING
 
+from app.db.postgresql.statements import labelled
+
 
 if TYPE_CHECKING:
-    from typing import Callable
+    from typing import Awaitable, Callable
+
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+
+AFTER_COMMIT = "after_commit"
+
+
+def after_commit(
+    session: "AsyncSession",
+    callback: "Callable[[], Awaitable]",
+):
+    """Schedules a callback to run once the transaction is committed."""
+
+    session.info.setdefault(AFTER_COMMIT, []).append(callback)
 
 
 def transaction(fn: "Callable"):
@@ -17,9 +33,22 @@ def transaction(fn: "Callable"):
         self = args[0]
         if commit:
             await self.session.commit()
+            for callback in self.session.info.pop(AFTER_COMMIT, []):
+                await callback()
         else:
             await self.session.flush()
 
         return result
 
     return wrapper
+
+
+def operation(fn: "Callable"):
+    """CRUD method decorator labelling its statements by the method name."""
+
+    @wraps(fn)
+    async def wrapper(*args, **kwargs):
+        with labelled(fn.__name__):
+            return await fn(*args, **kwargs)
+
+    return wrapper
@@ -1,10 +1,46 @@
 from typing import AsyncGenerator
 
+from fastapi import Depends, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.postgresql.base import SessionFactory
+from app.config import config
+from app.db.postgresql.base import database
+
+
+# Cookie pinning reads of a client to the primary after its writes
+PIN_COOKIE = "db_primary_pin"
 
 
 async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
-    async with SessionFactory() as session:
+    async with database.session() as session:
         yield session
+
+
+async def get_async_read_session(
+    request: Request,
+    session: AsyncSession = Depends(get_async_session),
+) -> AsyncGenerator[AsyncSession, None]:
+    """Session of a healthy replica, the primary one is the fallback."""
+
+    replica = None
+    if database.replicas and PIN_COOKIE not in request.cookies:
+        replica = await database.replicas.choose()
+
+    if replica is None:
+        yield session
+        return
+
+    async with replica.SessionFactory() as read_session:
+        yield read_session
+
+
+async def pin_to_primary(response: Response):
+    """Makes next reads of the client see its write for a while."""
+
+    if database.replicas and config.postgresql.read_your_writes > 0:
+        response.set_cookie(
+            PIN_COOKIE,
+            "1",
+            max_age=config.postgresql.read_your_writes,
+            httponly=True,
+        )
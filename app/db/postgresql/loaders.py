@@ -0,0 +1,108 @@
+import asyncio
+from typing import (
+    TYPE_CHECKING,
+    AsyncContextManager,
+    Callable,
+    Generic,
+    Optional,
+    Sequence,
+    Type,
+)
+from uuid import UUID
+
+from app.db.postgresql.crud import CRUD, Table
+
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class BatchLoader(Generic[Table]):
+    """Gathers concurrent lookups by primary key into one query.
+
+    Lookups arriving within `window` seconds (or until `max_size` distinct
+    keys are pending) are resolved by a single `CRUD.select_many` call in
+    a session of its own, so callers from different requests share it.
+    Loaded instances are detached and shared between the callers, treat
+    them as read-only.
+    """
+
+    def __init__(
+        self,
+        crud: Type[CRUD[Table]],
+        session_factory: Callable[[], AsyncContextManager["AsyncSession"]],
+        window: float = 0.002,
+        max_size: int = 500,
+    ):
+        self.crud = crud
+        self.session_factory = session_factory
+        self.window = window
+        self.max_size = max_size
+
+        self._pending: dict[str, list[asyncio.Future]] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: set[asyncio.Task] = set()
+
+        self.loads = 0
+        self.batches = 0
+
+    async def load(self, id_: UUID | str) -> Optional[Table]:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        self.loads += 1
+        self._pending.setdefault(str(id_), []).append(future)
+
+        if len(self._pending) >= self.max_size:
+            self._dispatch()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._dispatch)
+
+        return await future
+
+    async def load_many(
+        self,
+        ids: Sequence[UUID | str],
+    ) -> list[Optional[Table]]:
+        return list(await asyncio.gather(*[self.load(id_) for id_ in ids]))
+
+    def _dispatch(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        pending, self._pending = self._pending, {}
+        if not pending:
+            return
+
+        self.batches += 1
+
+        task = asyncio.create_task(self._resolve(pending))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _resolve(self, pending: dict[str, list[asyncio.Future]]):
+        try:
+            async with self.session_factory() as session:
+                crud = self.crud(session=session)
+                items = await crud.select_many(list(pending))
+                key = crud.primary_key.key
+        except Exception as e:
+            for futures in pending.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+            return
+
+        found = {str(getattr(item, key)): item for item in items}
+        for id_, futures in pending.items():
+            for future in futures:
+                if not future.done():
+                    future.set_result(found.get(id_))
+
+    def stats(self) -> dict:
+        return {
+            "loads": self.loads,
+            "batches": self.batches,
+            "pending": len(self._pending),
+        }
@@ -0,0 +1,58 @@
+import logging
+from typing import TYPE_CHECKING
+
+from app.config import config
+from app.db.postgresql.statements import QueryStats, query_stats
+
+
+if TYPE_CHECKING:
+    from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+logger = logging.getLogger(__name__)
+
+
+class QueryStatsMiddleware:
+    """Counts statements & database time of each request.
+
+    In debug mode they're sent back as `X-DB-Queries` & `X-DB-Time` (ms)
+    headers. Statements repeated `repeated_query_threshold` times within
+    a request are logged, they're likely N+1 lookups.
+    """
+
+    def __init__(self, app: "ASGIApp"):
+        self.app = app
+
+    async def __call__(self, scope: "Scope", receive: "Receive", send: "Send"):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+
+        async def send_with_stats(message: "Message"):
+            if message["type"] == "http.response.start" and config.app.debug:
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (b"x-db-queries", str(stats.count).encode()),
+                    (b"x-db-time", f"{stats.seconds * 1000:.3f}".encode()),
+                ]
+
+            await send(message)
+
+        token = query_stats.set(stats)
+        try:
+            await self.app(scope, receive, send_with_stats)
+        finally:
+            query_stats.reset(token)
+
+            threshold = config.postgresql.repeated_query_threshold
+            if threshold:
+                for statement, count in stats.repeated(threshold):
+                    logger.warning(
+                        "Statement repeated %s times by %s %s: %s",
+                        count,
+                        scope["method"],
+                        scope["path"],
+                        statement,
+                    )
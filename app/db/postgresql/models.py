@@ -1,7 +1,7 @@
 from datetime import datetime
 from uuid import uuid4
 
-from sqlalchemy import TIMESTAMP, func, text
+from sqlalchemy import TIMESTAMP, Integer, func, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -48,3 +48,15 @@ class Deleted:
         TIMESTAMP,
         nullable=True,
     )
+
+
+class Version:
+    """Mixin class for SQLAlchemy models version field."""
+
+    version: Mapped[int] = mapped_column(
+        "version",
+        Integer,
+        server_default=text("1"),
+        server_onupdate=text("version + 1"),
+        nullable=False,
+    )
@@ -0,0 +1,45 @@
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry
+
+from app.utils.histogram import Histogram
+
+
+# Upper bounds of connection acquire time buckets, seconds
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0)
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """Queue pool keeping track of how long connections are waited for.
+
+    The wait covers opening a connection when the pool grows, so it is
+    the time a request spends to get one.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        self.waits = Histogram(WAIT_BUCKETS)
+        self.timeouts = 0
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            self.waits.observe(time.perf_counter() - started)
+
+    def stats(self) -> dict:
+        return {
+            "size": self.size(),
+            "checked_in": self.checkedin(),
+            "checked_out": self.checkedout(),
+            "overflow": self.overflow(),
+            "max_overflow": self._max_overflow,
+            "timeouts": self.timeouts,
+            "waits": self.waits.stats(),
+        }
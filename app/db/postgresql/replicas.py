@@ -0,0 +1,122 @@
+import asyncio
+import itertools
+import logging
+import time
+from typing import Optional, Sequence
+
+from sqlalchemy import text
+from sqlalchemy.ext import asyncio as sa_async
+from sqlalchemy.orm import sessionmaker
+
+from app.db.postgresql.pool import InstrumentedPool
+
+
+logger = logging.getLogger(__name__)
+
+
+class Replica:
+    """Read-only database engine along with its health state."""
+
+    def __init__(self, dsn: str, **engine_options):
+        self.engine = sa_async.create_async_engine(
+            url=dsn,
+            future=True,
+            poolclass=InstrumentedPool,
+            **engine_options,
+        )
+        self.SessionFactory = sessionmaker(
+            bind=self.engine,
+            autocommit=False,
+            autoflush=False,
+            expire_on_commit=False,
+            class_=sa_async.AsyncSession,
+        )
+
+        self.healthy = True
+        self.checked_at = 0.0
+        self.reads = 0
+
+    @property
+    def name(self) -> str:
+        return self.engine.url.render_as_string(hide_password=True)
+
+    async def _ping(self):
+        async with self.engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    async def check(self, timeout: float) -> bool:
+        # Concurrent readers don't pile up checks of the same replica
+        self.checked_at = time.monotonic()
+
+        try:
+            await asyncio.wait_for(self._ping(), timeout=timeout)
+        except Exception as e:
+            if self.healthy:
+                logger.warning("Replica %s is down: %s", self.name, e)
+            self.healthy = False
+        else:
+            if not self.healthy:
+                logger.warning("Replica %s is up again", self.name)
+            self.healthy = True
+
+        return self.healthy
+
+
+class ReplicaSet:
+    """Round-robin choice of healthy replicas to serve reads.
+
+    A replica is checked with a `SELECT 1` once per `check_interval` at
+    most, when it's its turn. If none is healthy reads fail over to the
+    primary (`choose` returns nothing).
+    """
+
+    def __init__(
+        self,
+        dsns: Sequence[str],
+        check_interval: float = 5.0,
+        check_timeout: float = 1.0,
+        **engine_options,
+    ):
+        self.replicas = [Replica(dsn, **engine_options) for dsn in dsns]
+        self.check_interval = check_interval
+        self.check_timeout = check_timeout
+
+        self._turns = itertools.cycle(range(len(self.replicas)))
+        self.failovers = 0
+
+    def __bool__(self) -> bool:
+        return bool(self.replicas)
+
+    async def choose(self) -> Optional[Replica]:
+        for _ in range(len(self.replicas)):
+            replica = self.replicas[next(self._turns)]
+
+            if time.monotonic() - replica.checked_at >= self.check_interval:
+                await replica.check(timeout=self.check_timeout)
+
+            if replica.healthy:
+                replica.reads += 1
+                return replica
+
+        if self.replicas:
+            self.failovers += 1
+
+        return None
+
+    async def dispose(self):
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+    def stats(self) -> dict:
+        return {
+            "failovers": self.failovers,
+            "replicas": [
+                {
+                    "name": replica.name,
+                    "healthy": replica.healthy,
+                    "reads": replica.reads,
+                    "pool": replica.engine.pool.stats(),
+                }
+                for replica in self.replicas
+            ],
+        }
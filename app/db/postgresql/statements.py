@@ -0,0 +1,209 @@
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Any, Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.engine.default import CACHE_HIT, CACHE_MISS
+
+from app.config import config
+from app.metrics import registry
+
+
+logger = logging.getLogger(__name__)
+
+
+STATEMENT_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+)
+
+
+_TABLE = re.compile(r"\b(?:FROM|INTO|UPDATE)\s+\"?(\w+)", re.IGNORECASE)
+
+
+@lru_cache(maxsize=1024)
+def describe(statement: str) -> tuple[str, str]:
+    """Returns the operation & the first table of a SQL statement."""
+
+    op = statement.lstrip().split(None, 1)[0].lower() if statement else ""
+    table = _TABLE.search(statement)
+
+    return op, table.group(1) if table else ""
+
+
+class CompiledCacheStats:
+    """Counts compiled cache usage of executed statements by table.
+
+    Statements built from the same constructs (not from distinct text)
+    share a cache key, so they're compiled once and hit the cache after.
+    """
+
+    def __init__(self):
+        self.tables: dict[str, dict[str, int]] = {}
+
+    def observe(self, statement: str, cache_hit):
+        _, table = describe(statement)
+        counters = self.tables.setdefault(
+            table,
+            {"hits": 0, "misses": 0, "uncached": 0},
+        )
+
+        if cache_hit is CACHE_HIT:
+            counters["hits"] += 1
+        elif cache_hit is CACHE_MISS:
+            counters["misses"] += 1
+        else:
+            counters["uncached"] += 1
+
+    def clear(self):
+        self.tables.clear()
+
+    def stats(self) -> dict:
+        tables = {}
+        for table, counters in self.tables.items():
+            cached = counters["hits"] + counters["misses"]
+            tables[table] = {
+                **counters,
+                "hit_rate": counters["hits"] / cached if cached else 0.0,
+            }
+
+        return tables
+
+
+compiled_cache = CompiledCacheStats()
+
+statement_duration = registry.histogram(
+    "db_statement_duration_seconds",
+    "Database statement duration in seconds.",
+    labels=("op", "table"),
+    buckets=STATEMENT_BUCKETS,
+)
+
+
+class QueryStats:
+    """Counts statements executed on behalf of a single request."""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.statements: Counter[str] = Counter()
+
+    def observe(self, statement: str, seconds: float):
+        self.count += 1
+        self.seconds += seconds
+        self.statements[statement] += 1
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """Returns statements executed at least `threshold` times."""
+
+        return [
+            (statement, count)
+            for statement, count in self.statements.most_common()
+            if count >= threshold
+        ]
+
+
+# Set by the query stats middleware for the time of a request
+query_stats: ContextVar[Optional[QueryStats]] = ContextVar(
+    "query_stats",
+    default=None,
+)
+
+# Set by CRUD methods for the time of their statements
+crud_operation: ContextVar[Optional[str]] = ContextVar(
+    "crud_operation",
+    default=None,
+)
+
+
+@contextmanager
+def labelled(operation: str) -> Iterator[None]:
+    """Labels statements executed within by the CRUD operation."""
+
+    token = crud_operation.set(operation)
+    try:
+        yield
+    finally:
+        crud_operation.reset(token)
+
+
+def redact(parameters: Any) -> Any:
+    """Replaces statement parameter values by their type names."""
+
+    if isinstance(parameters, dict):
+        return {k: type(v).__name__ for k, v in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [redact(item) for item in parameters]
+
+    return type(parameters).__name__
+
+
+# |Events|
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_timer(
+    conn,
+    cursor,
+    statement,
+    parameters,
+    context,
+    executemany,
+):  # noqa: keep parameters
+    if context is not None:
+        context.started_at = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _observe_statement(
+    conn,
+    cursor,
+    statement,
+    parameters,
+    context,
+    executemany,
+):  # noqa: keep parameters
+    # Driver level statements (no compiled one) are counted as uncached
+    compiled_cache.observe(statement, getattr(context, "cache_hit", None))
+
+    started_at = getattr(context, "started_at", None)
+    if started_at is None:
+        return
+
+    seconds = time.perf_counter() - started_at
+
+    if config.app.metrics:
+        # Statements run outside CRUD methods go by their SQL verb
+        verb, table = describe(statement)
+        statement_duration.observe(
+            seconds,
+            crud_operation.get() or verb,
+            table,
+        )
+
+    stats = query_stats.get()
+    if stats is not None:
+        stats.observe(statement, seconds)
+
+    threshold = config.postgresql.slow_query_threshold
+    if threshold and seconds >= threshold:
+        logger.warning(
+            "Slow statement (%.3fs): %s; parameters: %s",
+            seconds,
+            statement,
+            redact(parameters),
+        )
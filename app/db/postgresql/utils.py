@@ -1,24 +1,74 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import date, datetime
+from enum import Enum
 from typing import TYPE_CHECKING, Any
+from uuid import UUID
 
-from sqlalchemy import text
+from sqlalchemy import Executable
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement
+from sqlalchemy.sql.visitors import InternalTraversal
 
 
 if TYPE_CHECKING:
-    from sqlalchemy import TextClause
+    from sqlalchemy import Column, Select
 
 
-def scalar_order_by(
-    order_by: list | Any,
-) -> list["TextClause"]:
-    if not isinstance(order_by, list):
-        order_by = [order_by]
+def _jsonable(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, Enum):
+        return value.value
 
-    items = []
+    raise TypeError(f"Type {type(value)} is not cursor serialisable!")
 
-    for item in order_by:
-        if item.desc:
-            items.append(text(f"{item.field} DESC"))
-        else:
-            items.append(text(item.field))
 
-    return items
+def encode_cursor(*values: Any) -> str:
+    """Packs values into an opaque url-safe cursor."""
+
+    payload = json.dumps(values, default=_jsonable, separators=(",", ":"))
+    return urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> list:
+    """Unpacks values from a cursor made by `encode_cursor`."""
+
+    padding = "=" * (-len(cursor) % 4)
+    values = json.loads(urlsafe_b64decode(cursor + padding))
+    if not isinstance(values, list):
+        raise ValueError("The cursor is malformed!")
+
+    return values
+
+
+def restore_value(column: "Column", value: Any) -> Any:
+    """Casts a cursor value back to the python type of the column."""
+
+    python_type = column.type.python_type
+    if value is None or isinstance(value, python_type):
+        return value
+    if not isinstance(value, str):
+        raise TypeError(f"The cursor value {value!r} is malformed!")
+    if python_type in (datetime, date):
+        return python_type.fromisoformat(value)
+
+    return python_type(value)
+
+
+class Explain(Executable, ClauseElement):
+    """Statement to get the JSON plan of a query without running it."""
+
+    inherit_cache = True
+    _traverse_internals = [("statement", InternalTraversal.dp_clauseelement)]
+
+    def __init__(self, statement: "Select"):
+        self.statement = statement
+
+
+@compiles(Explain, "postgresql")
+def _compile_explain(element: Explain, compiler, **kwargs):
+    statement = compiler.process(element.statement, **kwargs)
+    return f"EXPLAIN (FORMAT JSON) {statement}"
@@ -3,10 +3,19 @@ import uvicorn
 from app.config import config
 
 
+# On SIGTERM/SIGINT each worker stops accepting connections, waits for
+# the requests in flight and then runs the shutdown handlers of the app.
 uvicorn.run(
     app="app.entrypoints.main:create_app",
     factory=True,
     host=config.app.host,
     port=config.app.port,
     reload=config.app.reload,
+    workers=config.app.workers,
+    loop=config.app.loop,
+    http=config.app.http,
+    backlog=config.app.backlog,
+    timeout_keep_alive=config.app.keep_alive,
+    limit_concurrency=config.app.limit_concurrency,
+    limit_max_requests=config.app.limit_max_requests,
 )
@@ -1,9 +1,36 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 
 from app.config import config
+from app.db.postgresql.base import database
+from app.db.postgresql.middleware import QueryStatsMiddleware
+from app.metrics import MetricsMiddleware, registry
+from app.modules.heroes.services import HeroServices
 from app.routers import admin_router_v1, public_router_v1
 
 
+async def warm_heroes(session):
+    # Lookups of the batch loader would go through sessions of its own
+    await HeroServices(session=session, loader=None).warm()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    database.open()
+    if config.postgresql.warm_connections > 0:
+        await database.warm(
+            connections=config.postgresql.warm_connections,
+            warmer=warm_heroes,
+        )
+
+    yield
+
+    # The server has drained requests in flight by now
+    await database.dispose()
+
+
 def create_app():
     app = FastAPI(
         debug=config.app.debug,
@@ -13,6 +40,21 @@ def create_app():
     app.include_router(admin_router_v1)
     app.include_router(public_router_v1)
 
+    # FastAPI of this version takes no lifespan argument, the router does
+    app.router.lifespan_context = lifespan
+
+    app.add_middleware(QueryStatsMiddleware)
+
+    if config.app.metrics:
+        app.add_middleware(MetricsMiddleware)
+
+        @app.get("/metrics", tags=["monitoring"], include_in_schema=False)
+        async def metrics():
+            return PlainTextResponse(
+                registry.render(),
+                media_type="text/plain; version=0.0.4",
+            )
+
     @app.get("/health_check", tags=["monitoring"], include_in_schema=False)
     async def health_check():
         return {
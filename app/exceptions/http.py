@@ -3,6 +3,21 @@ from typing import Any, Optional, Dict
 from fastapi import HTTPException, status
 
 
+class HTTP400(HTTPException):
+    """HTTP exception for bad request errors."""
+
+    def __init__(
+        self,
+        detail: Any = None,
+        headers: Optional[Dict[str, Any]] = None,
+    ):
+        super().__init__(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=detail,
+            headers=headers,
+        )
+
+
 class HTTP403(HTTPException):
     """HTTP exception for not allowed errors."""
 
@@ -46,3 +61,18 @@ class HTTP409(HTTPException):
             detail=detail,
             headers=headers,
         )
+
+
+class HTTP412(HTTPException):
+    """HTTP exception for failed precondition errors."""
+
+    def __init__(
+        self,
+        detail: Any = None,
+        headers: Optional[Dict[str, Any]] = None,
+    ):
+        super().__init__(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail=detail,
+            headers=headers,
+        )
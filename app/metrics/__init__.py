@@ -0,0 +1,2 @@
+from .base import Gauge, HistogramMetric, Registry, registry
+from .middleware import MetricsMiddleware
@@ -0,0 +1,149 @@
+from abc import ABC, abstractmethod
+from typing import Sequence
+
+from app.utils.histogram import Histogram
+
+
+# Prometheus client defaults, seconds
+DURATION_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], **extra) -> str:
+    pairs = [*zip(names, values), *extra.items()]
+    if not pairs:
+        return ""
+
+    return "{" + ",".join(f'{k}="{_escape(str(v))}"' for k, v in pairs) + "}"
+
+
+class Metric(ABC):
+    """Base class for metrics with labelled series."""
+
+    type_: str
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: Sequence[str] = (),
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+
+    @abstractmethod
+    def samples(self) -> list[str]:
+        ...
+
+    def render(self) -> list[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type_}",
+            *self.samples(),
+        ]
+
+
+class Gauge(Metric):
+    """Metric for values going up & down, like requests in flight."""
+
+    type_ = "gauge"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.values: dict[tuple, float] = {}
+
+    def inc(self, *labels: str, value: float = 1.0):
+        self.values[labels] = self.values.get(labels, 0.0) + value
+
+    def dec(self, *labels: str, value: float = 1.0):
+        self.inc(*labels, value=-value)
+
+    def samples(self) -> list[str]:
+        return [
+            f"{self.name}{_labels(self.labels, labels)} {value}"
+            for labels, value in self.values.items()
+        ]
+
+
+class HistogramMetric(Metric):
+    """Metric for distributions, a histogram per labels combination."""
+
+    type_ = "histogram"
+
+    def __init__(
+        self,
+        *args,
+        buckets: Sequence[float] = DURATION_BUCKETS,
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        self.buckets = buckets
+        self.histograms: dict[tuple, Histogram] = {}
+
+    def observe(self, value: float, *labels: str):
+        histogram = self.histograms.get(labels)
+        if histogram is None:
+            histogram = self.histograms[labels] = Histogram(self.buckets)
+
+        histogram.observe(value)
+
+    def samples(self) -> list[str]:
+        samples = []
+        for labels, histogram in self.histograms.items():
+            stats = histogram.stats()
+            for bound, count in stats["buckets"].items():
+                label = _labels(self.labels, labels, le=bound)
+                samples.append(f"{self.name}_bucket{label} {count}")
+
+            label = _labels(self.labels, labels)
+            samples.append(f"{self.name}_sum{label} {stats['sum']}")
+            samples.append(f"{self.name}_count{label} {stats['count']}")
+
+        return samples
+
+
+class Registry:
+    """Collects metrics to expose them in Prometheus text format."""
+
+    def __init__(self):
+        self.metrics: dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        if metric.name in self.metrics:
+            raise ValueError(f"The metric {metric.name} is registered!")
+
+        self.metrics[metric.name] = metric
+
+        return metric
+
+    def gauge(self, *args, **kwargs) -> Gauge:
+        return self.register(Gauge(*args, **kwargs))
+
+    def histogram(self, *args, **kwargs) -> HistogramMetric:
+        return self.register(HistogramMetric(*args, **kwargs))
+
+    def render(self) -> str:
+        lines = []
+        for metric in self.metrics.values():
+            lines.extend(metric.render())
+
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
@@ -0,0 +1,74 @@
+import time
+from typing import TYPE_CHECKING
+
+from app.metrics.base import registry
+
+
+if TYPE_CHECKING:
+    from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+SIZE_BUCKETS = (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+
+# Requests not matched by any route share a label, paths aren't bounded
+UNMATCHED = "<unmatched>"
+
+http_in_flight = registry.gauge(
+    "http_requests_in_flight",
+    "HTTP requests being processed.",
+    labels=("method",),
+)
+http_duration = registry.histogram(
+    "http_request_duration_seconds",
+    "HTTP request duration in seconds.",
+    labels=("method", "route", "status"),
+)
+http_response_size = registry.histogram(
+    "http_response_size_bytes",
+    "HTTP response body size in bytes.",
+    labels=("method", "route", "status"),
+    buckets=SIZE_BUCKETS,
+)
+
+
+class MetricsMiddleware:
+    """Records duration & response size of HTTP requests by route.
+
+    It's a plain ASGI middleware, so streamed responses are neither
+    buffered nor wrapped, their body chunks are just counted.
+    """
+
+    def __init__(self, app: "ASGIApp"):
+        self.app = app
+
+    async def __call__(self, scope: "Scope", receive: "Receive", send: "Send"):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status, size = 500, 0
+
+        async def send_counted(message: "Message"):
+            nonlocal status, size
+
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+
+            await send(message)
+
+        started = time.perf_counter()
+        http_in_flight.inc(method)
+        try:
+            await self.app(scope, receive, send_counted)
+        finally:
+            http_in_flight.dec(method)
+
+            # The router puts the matched route into the scope
+            route = scope.get("route")
+            labels = (method, getattr(route, "path", UNMATCHED), str(status))
+
+            http_duration.observe(time.perf_counter() - started, *labels)
+            http_response_size.observe(size, *labels)
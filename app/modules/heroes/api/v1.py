@@ -1,24 +1,183 @@
+from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, status
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from fastapi.responses import StreamingResponse
 
+from app.config import config
+from app.db.postgresql.dependencies import pin_to_primary
 from app.modules.auth.api_token import get_api_key
 from app.modules.heroes.services import HeroServices, get_hero_services
 from app.modules.heroes.services.schemas import (
+    HeroBatch,
+    HeroBatchGet,
+    HeroBatchOperationsResult,
+    HeroBatchResult,
+    HeroBulkCreate,
+    HeroBulkResult,
     HeroCreate,
+    HeroFilter,
+    HeroImportResult,
     HeroPatch,
     HeroRetrieve,
     HeroSearch,
     HeroSearchResult,
     HeroUpdate,
 )
+from app.types.heroes import HeroFieldType, RoleType
+from app.types.search import MatchType
+from app.types.streams import StreamFormatType
+from app.utils.etags import make_etag, parse_etags
+from app.utils.responses import FastJSONResponse
 from app.utils.schemas import StatusMessage
+from app.utils.streams import MEDIA_TYPES
+
+
+async def _conditional_get(
+    heroes: HeroServices,
+    hero_id: UUID,
+    as_staff: bool,
+    response: Response,
+    if_none_match: Optional[str],
+    fields: Optional[list[HeroFieldType]] = None,
+) -> HeroRetrieve | Response:
+    """Answers `If-None-Match` by the hero version only if it's possible."""
+
+    versions = parse_etags(if_none_match, weak=True)
+    if versions:
+        version = await heroes.get_version(hero_id=hero_id, as_staff=as_staff)
+        if version in versions:
+            return Response(
+                status_code=status.HTTP_304_NOT_MODIFIED,
+                headers={"ETag": make_etag(version)},
+            )
+
+    if fields:
+        version, content = await heroes.get_fields(
+            hero_id=hero_id,
+            fields=[field.value for field in fields],
+            as_staff=as_staff,
+        )
+        return FastJSONResponse(
+            content=content,
+            headers={"ETag": make_etag(version)},
+        )
+
+    hero = await heroes.get(hero_id=hero_id, as_staff=as_staff)
+    if config.app.fast_json:
+        return FastJSONResponse(
+            content=hero,
+            headers={"ETag": make_etag(hero.version)},
+        )
+
+    response.headers["ETag"] = make_etag(hero.version)
+
+    return hero
+
+
+async def _search(
+    heroes: HeroServices,
+    schema: HeroSearch,
+    as_staff: bool,
+) -> HeroSearchResult | Response:
+    result = await heroes.search(
+        schema=schema,
+        as_staff=as_staff,
+        raw=config.app.fast_json,
+    )
+    if isinstance(result, bytes):
+        return FastJSONResponse(content=result)
+
+    return result
 
 
 # |Admin|
 admin_router = APIRouter(prefix="/heroes", tags=["admin/heroes"])
 
 
+@admin_router.get(
+    "/batch-get",
+    response_model=HeroBatchResult,
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(get_api_key)],
+)
+async def get_heroes_as_staff(
+    ids: list[UUID] = Query(
+        min_items=1,
+        max_items=config.app.batch_get_max_size,
+    ),
+    heroes: HeroServices = Depends(get_hero_services),
+):
+    return await heroes.get_many(hero_ids=ids, as_staff=True)
+
+
+@admin_router.post(
+    "/batch-get",
+    response_model=HeroBatchResult,
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(get_api_key)],
+)
+async def post_get_heroes_as_staff(
+    schema: HeroBatchGet,
+    heroes: HeroServices = Depends(get_hero_services),
+):
+    return await heroes.get_many(hero_ids=schema.ids, as_staff=True)
+
+
+@admin_router.post(
+    "/import",
+    response_model=HeroImportResult,
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(get_api_key), Depends(pin_to_primary)],
+)
+async def import_heroes_as_staff(
+    request: Request,
+    format_: StreamFormatType = Query(
+        StreamFormatType.NDJSON,
+        alias="format",
+    ),
+    heroes: HeroServices = Depends(get_hero_services),
+):
+    return await heroes.import_(chunks=request.stream(), format_=format_)
+
+
+@admin_router.get(
+    "/export",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(get_api_key)],
+)
+async def export_heroes_as_staff(
+    format_: StreamFormatType = Query(
+        StreamFormatType.NDJSON,
+        alias="format",
+    ),
+    nickname: Optional[str] = Query(None, max_length=255),
+    match: MatchType = MatchType.CONTAINS,
+    role: Optional[RoleType] = None,
+    heroes: HeroServices = Depends(get_hero_services),
+):
+    schema = HeroFilter(nickname=nickname, match=match, role=role)
+
+    return StreamingResponse(
+        heroes.export(schema=schema, format_=format_, as_staff=True),
+        media_type=MEDIA_TYPES[format_],
+        headers={
+            "Content-Disposition": (
+                f"attachment; filename=heroes.{format_.value}"
+            ),
+        },
+    )
+
+
 @admin_router.get(
     "/{hero_id}",
     response_model=HeroRetrieve,
@@ -27,24 +186,39 @@ admin_router = APIRouter(prefix="/heroes", tags=["admin/heroes"])
 )
 async def get_hero_as_staff(
     hero_id: UUID,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    fields: Optional[list[HeroFieldType]] = Query(None),
     heroes: HeroServices = Depends(get_hero_services),
 ):
-    return await heroes.get(hero_id=hero_id, as_staff=True)
+    return await _conditional_get(
+        heroes=heroes,
+        hero_id=hero_id,
+        as_staff=True,
+        response=response,
+        if_none_match=if_none_match,
+        fields=fields,
+    )
 
 
 @admin_router.delete(
     "/{hero_id}",
     response_model=StatusMessage,
     status_code=status.HTTP_200_OK,
-    dependencies=[Depends(get_api_key)],
+    dependencies=[Depends(get_api_key), Depends(pin_to_primary)],
 )
 async def delete_hero_as_staff(
     hero_id: UUID,
     permanent: bool = False,
+    if_match: Optional[str] = Header(None),
     heroes: HeroServices = Depends(get_hero_services),
 ):
     return {
-        "status": await heroes.delete(hero_id=hero_id, permanent=permanent),
+        "status": await heroes.delete(
+            hero_id=hero_id,
+            permanent=permanent,
+            versions=parse_etags(if_match),
+        ),
         "message": "The hero has been deleted!",
     }
 
@@ -59,7 +233,7 @@ async def search_hero_as_staff(
     schema: HeroSearch,
     heroes: HeroServices = Depends(get_hero_services),
 ):
-    return await heroes.search(schema=schema, as_staff=True)
+    return await _search(heroes=heroes, schema=schema, as_staff=True)
 
 
 # |Public|
@@ -70,6 +244,7 @@ public_router = APIRouter(prefix="/heroes", tags=["public/heroes"])
     "",
     response_model=HeroRetrieve,
     status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(pin_to_primary)],
 )
 async def create_hero(
     schema: HeroCreate,
@@ -78,6 +253,59 @@ async def create_hero(
     return await heroes.create(schema=schema)
 
 
+@public_router.post(
+    "/bulk",
+    response_model=HeroBulkResult,
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(pin_to_primary)],
+)
+async def create_heroes(
+    schema: HeroBulkCreate,
+    heroes: HeroServices = Depends(get_hero_services),
+):
+    return await heroes.create_many(schema=schema)
+
+
+@public_router.post(
+    "/batch",
+    response_model=HeroBatchOperationsResult,
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(pin_to_primary)],
+)
+async def run_heroes_batch(
+    schema: HeroBatch,
+    heroes: HeroServices = Depends(get_hero_services),
+):
+    return await heroes.batch(schema=schema)
+
+
+@public_router.get(
+    "/batch-get",
+    response_model=HeroBatchResult,
+    status_code=status.HTTP_200_OK,
+)
+async def get_heroes(
+    ids: list[UUID] = Query(
+        min_items=1,
+        max_items=config.app.batch_get_max_size,
+    ),
+    heroes: HeroServices = Depends(get_hero_services),
+):
+    return await heroes.get_many(hero_ids=ids, as_staff=False)
+
+
+@public_router.post(
+    "/batch-get",
+    response_model=HeroBatchResult,
+    status_code=status.HTTP_200_OK,
+)
+async def post_get_heroes(
+    schema: HeroBatchGet,
+    heroes: HeroServices = Depends(get_hero_services),
+):
+    return await heroes.get_many(hero_ids=schema.ids, as_staff=False)
+
+
 @public_router.get(
     "/{hero_id}",
     response_model=HeroRetrieve,
@@ -85,48 +313,85 @@ async def create_hero(
 )
 async def get_hero(
     hero_id: UUID,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    fields: Optional[list[HeroFieldType]] = Query(None),
     heroes: HeroServices = Depends(get_hero_services),
 ):
-    return await heroes.get(hero_id=hero_id, as_staff=False)
+    return await _conditional_get(
+        heroes=heroes,
+        hero_id=hero_id,
+        as_staff=False,
+        response=response,
+        if_none_match=if_none_match,
+        fields=fields,
+    )
 
 
 @public_router.put(
     "/{hero_id}",
     response_model=HeroRetrieve,
     status_code=status.HTTP_200_OK,
+    dependencies=[Depends(pin_to_primary)],
 )
 async def update_hero(
     hero_id: UUID,
     schema: HeroUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None),
     heroes: HeroServices = Depends(get_hero_services),
 ):
-    return await heroes.update(hero_id=hero_id, schema=schema)
+    hero = await heroes.update(
+        hero_id=hero_id,
+        schema=schema,
+        versions=parse_etags(if_match),
+    )
+    response.headers["ETag"] = make_etag(hero.version)
+
+    return hero
 
 
 @public_router.patch(
     "/{hero_id}",
     response_model=HeroRetrieve,
     status_code=status.HTTP_200_OK,
+    dependencies=[Depends(pin_to_primary)],
 )
 async def patch_hero(
     hero_id: UUID,
     schema: HeroPatch,
+    response: Response,
+    if_match: Optional[str] = Header(None),
     heroes: HeroServices = Depends(get_hero_services),
 ):
-    return await heroes.update(hero_id=hero_id, schema=schema, patch=True)
+    hero = await heroes.update(
+        hero_id=hero_id,
+        schema=schema,
+        patch=True,
+        versions=parse_etags(if_match),
+    )
+    response.headers["ETag"] = make_etag(hero.version)
+
+    return hero
 
 
 @public_router.delete(
     "/{hero_id}",
     response_model=StatusMessage,
     status_code=status.HTTP_200_OK,
+    dependencies=[Depends(pin_to_primary)],
 )
 async def delete_hero(
     hero_id: UUID,
+    if_match: Optional[str] = Header(None),
     heroes: HeroServices = Depends(get_hero_services),
 ):
     return {
-        "status": await heroes.delete(hero_id=hero_id, permanent=False),
+        "status": await heroes.delete(
+            hero_id=hero_id,
+            permanent=False,
+            versions=parse_etags(if_match),
+        ),
         "message": "The hero has been deleted!",
     }
 
@@ -140,5 +405,4 @@ async def search_hero(
     schema: HeroSearch,
     heroes: HeroServices = Depends(get_hero_services),
 ):
-    count, items = await heroes.search(schema=schema)
-    return {"count": count, "items": items}
+    return await _search(heroes=heroes, schema=schema, as_staff=False)
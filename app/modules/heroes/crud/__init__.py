@@ -1 +1,2 @@
 from .base import HeroCRUD
+from .loaders import heroes_loader, heroes_replica_loader
@@ -6,3 +6,10 @@ class HeroCRUD(CRUD[Hero]):
     """CRUD operations for hero model."""
 
     table = Hero
+
+    orderable = {
+        "uuid": "pk__hrs_heroes",
+        "nickname": "ix__hrs_heroes__nickname",
+        "created_at": "ix__hrs_heroes__created_at_uuid",
+        "updated_at": "ix__hrs_heroes__updated_at_uuid",
+    }
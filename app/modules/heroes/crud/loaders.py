@@ -0,0 +1,22 @@
+from app.config import config
+from app.db.postgresql.base import database
+from app.db.postgresql.loaders import BatchLoader
+from app.modules.heroes.crud.base import HeroCRUD
+
+
+# Lookups of clients pinned to the primary and ones free to read from a
+# replica are batched apart.
+heroes_loader = heroes_replica_loader = None
+if config.postgresql.batch_window > 0:
+    heroes_loader = BatchLoader(
+        crud=HeroCRUD,
+        session_factory=database.session,
+        window=config.postgresql.batch_window,
+        max_size=config.postgresql.batch_max_size,
+    )
+    heroes_replica_loader = BatchLoader(
+        crud=HeroCRUD,
+        session_factory=database.read_session,
+        window=config.postgresql.batch_window,
+        max_size=config.postgresql.batch_max_size,
+    )
@@ -1,17 +1,29 @@
-from sqlalchemy import String
+from sqlalchemy import Index, String
 
 from app.db.postgresql.base import Base
 
 from sqlalchemy.orm import Mapped, mapped_column
 
-from app.db.postgresql.models import ID, Timestamp, Deleted
+from app.db.postgresql.models import ID, Timestamp, Deleted, Version
 from app.types.heroes import RoleType
 
 
-class Hero(Base, Deleted, Timestamp, ID):
+class Hero(Base, Version, Deleted, Timestamp, ID):
     """Declaration of the hero model that reflects as database table."""
 
     __tablename__ = "hrs_heroes"
+    __table_args__ = (
+        # |Keyset pagination|
+        Index(None, "created_at", "uuid"),
+        Index(None, "updated_at", "uuid"),
+        # |Nickname search|
+        Index(
+            "ix__hrs_heroes__nickname_trgm",
+            "nickname",
+            postgresql_using="gin",
+            postgresql_ops={"nickname": "gin_trgm_ops"},
+        ),
+    )
 
     # |Types|
     ROLE = RoleType
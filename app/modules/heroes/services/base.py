@@ -1,33 +1,139 @@
+import logging
+import time
 from datetime import datetime
-from typing import TYPE_CHECKING, Sequence, Union
-from uuid import UUID
+from typing import (
+    TYPE_CHECKING,
+    AsyncIterable,
+    AsyncIterator,
+    Optional,
+    Sequence,
+    Union,
+)
+from uuid import UUID, uuid4
 
-from sqlalchemy.sql.operators import ilike_op
+from fastapi import HTTPException
+from pydantic import ValidationError
+from sqlalchemy import func, literal
 
-from app.db.postgresql.decorators import transaction
-from app.db.postgresql.utils import scalar_order_by
-from app.modules.heroes.crud import HeroCRUD
+from app.config import config
+from app.db.postgresql.decorators import (
+    AFTER_COMMIT,
+    after_commit,
+    transaction,
+)
+from app.exceptions.http import HTTP400, HTTP412
+from app.modules.heroes.crud import (
+    HeroCRUD,
+    heroes_loader,
+    heroes_replica_loader,
+)
 from app.modules.heroes.crud.models import Hero
+from app.modules.heroes.services.cache import (
+    heroes_cache,
+    heroes_flights,
+    heroes_search_cache,
+)
+from app.modules.heroes.services.schemas import (
+    HeroBatchOperationsResult,
+    HeroBatchResult,
+    HeroBulkItem,
+    HeroBulkResult,
+    HeroCreate,
+    HeroImportError,
+    HeroImportResult,
+    HeroOperationResult,
+    HeroRetrieve,
+    HeroSearchResult,
+)
+from app.types.search import MatchType
+from app.types.streams import StreamFormatType
 from app.utils.decorators import duplicate, not_found
+from app.utils.serialization import dumps, fields_of
+from app.utils.streams import encode_rows, iter_rows
 
 
 if TYPE_CHECKING:
     from sqlalchemy.ext.asyncio import AsyncSession
 
+    from app.cache import GenerationalCache, LRUCache
+    from app.db.postgresql.loaders import BatchLoader
     from app.modules.heroes.services.schemas import (
-        HeroCreate,
+        HeroBatch,
+        HeroBulkCreate,
+        HeroFilter,
+        HeroOperation,
         HeroPatch,
         HeroSearch,
         HeroUpdate,
     )
+    from app.utils.singleflight import SingleFlight
+
+
+logger = logging.getLogger(__name__)
 
 
 class HeroServices:
     """Services to manage hero functionality."""
 
-    def __init__(self, session: "AsyncSession"):
+    # Sources of reads, each one is cached & coalesced apart
+    SOURCES = ("primary", "replica")
+
+    def __init__(
+        self,
+        session: "AsyncSession",
+        read_session: Optional["AsyncSession"] = None,
+        cache: "LRUCache" = heroes_cache,
+        search_cache: "GenerationalCache" = heroes_search_cache,
+        flights: "SingleFlight" = heroes_flights,
+        loader: Optional["BatchLoader[Hero]"] = heroes_loader,
+        replica_loader: Optional["BatchLoader[Hero]"] = heroes_replica_loader,
+    ):
         self.session = session
         self.heroes = HeroCRUD(session=session)
+        # Reads may be served by a replica, writes never are
+        self.reader = HeroCRUD(session=read_session or session)
+        # A lagging replica can't fill entries seen by clients pinned to
+        # the primary, nor lead lookups they join.
+        self.source = "primary"
+        if read_session is not None and read_session is not session:
+            self.source = "replica"
+        self.cache = cache
+        self.search_cache = search_cache
+        self.flights = flights
+        self.loader = loader
+        if self.source == "replica":
+            self.loader = replica_loader
+
+    def _key(self, hero_id: UUID | str, as_staff: bool) -> tuple:
+        return str(hero_id), as_staff, self.source
+
+    def _invalidate(self, hero_id: Optional[UUID | str] = None):
+        """Drops cached reads affected by a hero write.
+
+        Search results go stale by a generation bump after the commit. Hero
+        entries (and lookups in flight) are dropped right away and once
+        again after the commit, reads started before a drop don't store
+        what they've read (see `LRUCache.token`).
+        """
+
+        keys = []
+        if hero_id is not None:
+            keys = [
+                (str(hero_id), as_staff, source)
+                for as_staff in (False, True)
+                for source in self.SOURCES
+            ]
+
+        def forget():
+            self.cache.delete(*keys)
+            self.flights.forget(*[("get", *key) for key in keys])
+
+        async def invalidate():
+            forget()
+            await self.search_cache.bump()
+
+        forget()
+        after_commit(self.session, invalidate)
 
     @transaction
     @duplicate(detail="The hero already exists!")
@@ -36,23 +142,276 @@ class HeroServices:
         schema: "HeroCreate",
         _commit: bool = True,
     ) -> Hero:
+        self._invalidate()
+
         return await self.heroes.insert(data=schema.dict())
 
+    @transaction
+    async def create_many(
+        self,
+        schema: "HeroBulkCreate",
+        _commit: bool = True,
+    ) -> HeroBulkResult:
+        self._invalidate()
+
+        # Repeated nicknames are sent once, so the first occurrence is the
+        # one created and the rest are reported as conflicts.
+        data = {}
+        for item in schema.items:
+            data.setdefault(item.nickname, item.dict())
+
+        instances = await self.heroes.insert_many(list(data.values()))
+        heroes = {instance.nickname: instance for instance in instances}
+
+        items = []
+        for index, item in enumerate(schema.items):
+            hero = heroes.pop(item.nickname, None)
+            items.append(
+                HeroBulkItem(
+                    index=index,
+                    nickname=item.nickname,
+                    created=hero is not None,
+                    hero=hero,
+                ),
+            )
+
+        return HeroBulkResult(
+            created=len(instances),
+            conflicts=[item.nickname for item in items if not item.created],
+            items=items,
+        )
+
+    async def import_(
+        self,
+        chunks: AsyncIterable[bytes],
+        format_: StreamFormatType = StreamFormatType.NDJSON,
+        chunk_size: int = config.app.import_chunk_size,
+        max_errors: int = 100,
+    ) -> HeroImportResult:
+        """Streams heroes from NDJSON or CSV into the table via COPY.
+
+        Valid rows are loaded and committed by chunks, so the memory used
+        doesn't depend on the stream size. Rows with taken nicknames are
+        counted as conflicts, the first `max_errors` invalid ones are
+        reported.
+        """
+
+        started = time.perf_counter()
+        columns = list(HeroCreate.__fields__)
+
+        rows = imported = copied = 0
+        errors = []
+        records = []
+
+        async def flush():
+            nonlocal imported, copied
+
+            imported += await self._import(records, columns=columns)
+            copied += len(records)
+            records.clear()
+
+            logger.info(
+                "Heroes import: %s rows read, %s imported, %.0f rows/s",
+                rows,
+                imported,
+                rows / (time.perf_counter() - started),
+            )
+
+        async for line, row in iter_rows(chunks, format_=format_):
+            rows += 1
+            try:
+                if isinstance(row, ValueError):
+                    raise row
+
+                hero = HeroCreate.parse_obj(row).dict()
+            except (ValidationError, ValueError) as e:
+                if len(errors) < max_errors:
+                    errors.append(HeroImportError(line=line, detail=str(e)))
+                continue
+
+            records.append(tuple(hero[column] for column in columns))
+            if len(records) >= chunk_size:
+                await flush()
+
+        if records:
+            await flush()
+
+        seconds = time.perf_counter() - started
+
+        return HeroImportResult(
+            rows=rows,
+            imported=imported,
+            conflicts=copied - imported,
+            invalid=rows - copied,
+            errors=errors,
+            seconds=round(seconds, 3),
+            rows_per_second=round(rows / seconds if seconds else 0, 1),
+        )
+
+    @transaction
+    async def _import(
+        self,
+        records: list[tuple],
+        columns: list[str],
+        _commit: bool = True,
+    ) -> int:
+        self._invalidate()
+
+        return await self.heroes.copy(records=records, columns=columns)
+
+    async def warm(self):
+        """Runs the hot hero reads, looking up a missing hero.
+
+        Their statements get compiled and prepared on the connection of
+        the session, so first requests served by it don't pay for that.
+        """
+
+        hero_id = uuid4()
+        for as_staff in (False, True):
+            await self._get(hero_id=hero_id, as_staff=as_staff)
+            await self.get_version(hero_id=hero_id, as_staff=as_staff)
+            await self.get_many([hero_id], as_staff=as_staff)
+
     @not_found(detail="The hero hasn't been found!")
     async def get(
         self,
         hero_id: UUID | str,
         as_staff: bool = False,
         _one_or_none: bool = False,
-    ) -> Hero:
+    ) -> Optional[HeroRetrieve]:
+        key = self._key(hero_id, as_staff)
+        hero = self.cache.get(key)
+        if hero is not None:
+            return hero
+
+        return await self.flights.do(
+            ("get", *key),
+            lambda: self._get(hero_id=hero_id, as_staff=as_staff),
+        )
+
+    async def _get(
+        self,
+        hero_id: UUID | str,
+        as_staff: bool,
+    ) -> Optional[HeroRetrieve]:
+        token = self.cache.token()
+        if self.loader is not None:
+            instance = await self.loader.load(hero_id)
+            if instance is not None and not as_staff and instance.deleted_at:
+                instance = None
+        else:
+            filters = [Hero.uuid == hero_id]
+            if not as_staff:
+                filters.append(Hero.deleted_at.is_(None))
+
+            instance = await self.reader.select(
+                *filters,
+                one_or_none=True,
+            )
+
+        if instance is None:
+            return None
+
+        hero = HeroRetrieve.from_orm(instance)
+        self.cache.set(self._key(hero_id, as_staff), hero, token=token)
+
+        return hero
+
+    @not_found(detail="The hero hasn't been found!")
+    async def get_fields(
+        self,
+        hero_id: UUID | str,
+        fields: Sequence[str],
+        as_staff: bool = False,
+        _one_or_none: bool = False,
+    ) -> Optional[tuple[int, dict]]:
+        """Returns the hero version and values of the fields only."""
+
+        hero = self.cache.get(self._key(hero_id, as_staff))
+        if hero is not None:
+            return hero.version, fields_of(hero, fields)
+
         filters = [Hero.uuid == hero_id]
         if not as_staff:
             filters.append(Hero.deleted_at.is_(None))
 
-        return await self.heroes.select(
+        row = await self.reader.select(
             *filters,
+            columns=self.reader.columns(*dict.fromkeys([*fields, "version"])),
             one_or_none=True,
         )
+        if row is None:
+            return None
+
+        return row["version"], fields_of(row, fields)
+
+    async def get_version(
+        self,
+        hero_id: UUID | str,
+        as_staff: bool = False,
+    ) -> Optional[int]:
+        """Returns the hero version without loading the whole record."""
+
+        hero = self.cache.get(self._key(hero_id, as_staff))
+        if hero is not None:
+            return hero.version
+
+        filters = [Hero.uuid == hero_id]
+        if not as_staff:
+            filters.append(Hero.deleted_at.is_(None))
+
+        return await self.reader.select_scalar(Hero.version, *filters)
+
+    async def _check_versions(
+        self,
+        hero_id: UUID | str,
+        versions: Optional[list[int]],
+        *filters,
+    ):
+        # The conditional statement has missed, it's a failed precondition
+        # (not a missing hero) if the hero is still there.
+        if versions is None:
+            return
+
+        version = await self.heroes.select_scalar(
+            Hero.version,
+            Hero.uuid == hero_id,
+            *filters,
+        )
+        if version is not None:
+            raise HTTP412(detail="The hero has been modified!")
+
+    async def get_many(
+        self,
+        hero_ids: list[UUID | str],
+        as_staff: bool = False,
+    ) -> HeroBatchResult:
+        ids = list(dict.fromkeys(str(hero_id) for hero_id in hero_ids))
+
+        heroes = {}
+        for id_ in ids:
+            hero = self.cache.get(self._key(id_, as_staff))
+            if hero is not None:
+                heroes[id_] = hero
+
+        filters = []
+        if not as_staff:
+            filters.append(Hero.deleted_at.is_(None))
+
+        token = self.cache.token()
+        instances = await self.reader.select_many(
+            [id_ for id_ in ids if id_ not in heroes],
+            *filters,
+        )
+        for instance in instances:
+            hero = HeroRetrieve.from_orm(instance)
+            heroes[str(hero.uuid)] = hero
+            self.cache.set(self._key(hero.uuid, as_staff), hero, token=token)
+
+        return HeroBatchResult(
+            items=[heroes[id_] for id_ in ids if id_ in heroes],
+            missing=[id_ for id_ in ids if id_ not in heroes],
+        )
 
     @transaction
     @duplicate(detail="The hero already exists!")
@@ -62,13 +421,25 @@ class HeroServices:
         hero_id: UUID | str,
         schema: Union["HeroUpdate", "HeroPatch"],
         patch: bool = False,
+        versions: Optional[list[int]] = None,
         _one_or_none: bool = False,
         _commit: bool = True,
     ) -> Hero:
-        return await self.heroes.update(
-            id_=hero_id,
-            data=schema.dict(exclude_unset=patch),
+        self._invalidate(hero_id)
+
+        filters = []
+        if versions is not None:
+            filters.append(Hero.version.in_(versions))
+
+        hero = await self.heroes.update(
+            hero_id,
+            schema.dict(exclude_unset=patch),
+            *filters,
         )
+        if hero is None:
+            await self._check_versions(hero_id, versions)
+
+        return hero
 
     @transaction
     @not_found(detail="The hero hasn't been found!")
@@ -76,42 +447,276 @@ class HeroServices:
         self,
         hero_id: UUID | str,
         permanent: bool = False,
+        versions: Optional[list[int]] = None,
         _one_or_none: bool = False,
         _commit: bool = True,
     ) -> bool | None:
+        self._invalidate(hero_id)
+
+        filters = []
+        if not permanent:
+            filters.append(Hero.deleted_at.is_(None))
+
+        conditions = []
+        if versions is not None:
+            conditions.append(Hero.version.in_(versions))
+
         if permanent:
-            await self.heroes.delete(id_=hero_id)
+            deleted = await self.heroes.delete(hero_id, *conditions)
         else:
-            hero = await self.heroes.update(
-                id_=hero_id,
-                data={"deleted_at": datetime.utcnow()},
+            deleted = await self.heroes.update(
+                hero_id,
+                {"deleted_at": datetime.utcnow()},
+                *filters,
+                *conditions,
             )
-            if hero is None:
-                return hero
+
+        if not deleted:
+            await self._check_versions(hero_id, versions, *filters)
+            return None
 
         return True
 
-    async def search(
+    @transaction
+    async def batch(
         self,
-        schema: "HeroSearch",
-        as_staff: bool = False,
-    ) -> tuple[int, Sequence[Hero] | None]:
+        schema: "HeroBatch",
+        _commit: bool = True,
+    ) -> HeroBatchOperationsResult:
+        """Runs operations in order within one transaction.
+
+        The operations only flush, the batch commits once. The first failed
+        one rolls back the whole batch and its error gets the index.
+        """
+
+        items = []
+        for index, operation in enumerate(schema.operations):
+            try:
+                hero = await self._run(operation)
+            except HTTPException as e:
+                await self.session.rollback()
+                self.session.info.pop(AFTER_COMMIT, None)
+
+                raise HTTPException(
+                    status_code=e.status_code,
+                    detail={
+                        "index": index,
+                        "op": operation.op,
+                        "detail": e.detail,
+                    },
+                    headers=e.headers,
+                )
+
+            items.append(
+                HeroOperationResult(index=index, op=operation.op, hero=hero),
+            )
+
+        return HeroBatchOperationsResult(items=items)
+
+    async def _run(self, operation: "HeroOperation") -> Optional[Hero]:
+        if operation.op == "create":
+            return await self.create(schema=operation.data, _commit=False)
+        if operation.op in ("update", "patch"):
+            return await self.update(
+                hero_id=operation.hero_id,
+                schema=operation.data,
+                patch=operation.op == "patch",
+                _commit=False,
+            )
+
+        await self.delete(hero_id=operation.hero_id, _commit=False)
+
+    @staticmethod
+    def _filters(schema: "HeroFilter", as_staff: bool) -> list:
         filters = []
 
-        if schema.nickname:
+        # Every match mode is served by an index: contains & prefix by the
+        # trigram one, exact by the unique one.
+        if schema.nickname and schema.match == MatchType.EXACT:
+            filters.append(Hero.nickname == schema.nickname)
+        elif schema.nickname and schema.match == MatchType.PREFIX:
             filters.append(
-                ilike_op(Hero.nickname, f"%{schema.nickname}%"),
+                Hero.nickname.istartswith(schema.nickname, autoescape=True),
+            )
+        elif schema.nickname:
+            filters.append(
+                Hero.nickname.icontains(schema.nickname, autoescape=True),
             )
 
+        # The column enum is declared by values rather than the python enum,
+        # so the value is bound with the column type explicitly.
         if schema.role:
-            filters.append(Hero.role == schema.role)
+            filters.append(
+                Hero.role == literal(schema.role.value, Hero.role.type),
+            )
 
         if not as_staff:
             filters.append(Hero.deleted_at.is_(None))
 
-        return await self.heroes.select_with_count(
+        return filters
+
+    async def export(
+        self,
+        schema: "HeroFilter",
+        format_: StreamFormatType = StreamFormatType.NDJSON,
+        as_staff: bool = False,
+        batch_size: int = config.app.export_batch_size,
+    ) -> AsyncIterator[bytes]:
+        """Streams heroes matching the filters as NDJSON or CSV.
+
+        Rows are fetched from a server side cursor by `batch_size` and
+        encoded as they come, nothing is loaded as a whole.
+        """
+
+        partitions = self.reader.stream(
+            *self._filters(schema=schema, as_staff=as_staff),
+            order_by=self.heroes.seek_order_by("created_at", desc=False),
+            yield_per=batch_size,
+        )
+        async for chunk in encode_rows(
+            partitions,
+            format_=format_,
+            fields=list(HeroRetrieve.__fields__),
+        ):
+            yield chunk
+
+    async def search(
+        self,
+        schema: "HeroSearch",
+        as_staff: bool = False,
+        raw: bool = False,
+    ) -> HeroSearchResult | bytes:
+        """Searches heroes, as JSON bytes ready to be sent if `raw`.
+
+        Sparse fieldsets don't fit the result model, so searches selecting
+        `fields` always come as bytes.
+        """
+
+        raw = raw or bool(schema.fields)
+        key = await self.search_cache.key(
+            schema.json(sort_keys=True),
+            as_staff,
+            self.source,
+        )
+        cached = await self.search_cache.get(key)
+        if cached is not None:
+            return cached if raw else HeroSearchResult.parse_raw(cached)
+
+        if key is None:
+            return await self._search(
+                schema=schema,
+                as_staff=as_staff,
+                raw=raw,
+            )
+
+        # The key embeds the cache generation, so searches arriving after
+        # a write never join a flight started before it.
+        return await self.flights.do(
+            ("search", key, raw),
+            lambda: self._search(
+                schema=schema,
+                as_staff=as_staff,
+                raw=raw,
+                key=key,
+            ),
+        )
+
+    async def _search(
+        self,
+        schema: "HeroSearch",
+        as_staff: bool,
+        raw: bool = False,
+        key: Optional[str] = None,
+    ) -> HeroSearchResult | bytes:
+        filters = self._filters(schema=schema, as_staff=as_staff)
+
+        # Only indexed columns are sortable, built from columns (not text)
+        # the orderings compile into a few statements hitting the cache.
+        try:
+            order_by = self.heroes.order_by(schema.order_by)
+        except ValueError as e:
+            raise HTTP400(detail=str(e))
+
+        # Single field ordering is resolved to a keyset one (with uuid as a
+        # tiebreaker), so pages can be continued with a cursor.
+        sort = schema.order_by[0] if len(schema.order_by) == 1 else None
+        if sort:
+            seek_order_by = self.heroes.seek_order_by(
+                sort.field,
+                desc=sort.desc,
+            )
+            if seek_order_by is None:
+                sort = None
+            else:
+                order_by = seek_order_by
+
+        if schema.nickname and schema.rank:
+            sort = None
+            order_by = [
+                func.similarity(Hero.nickname, schema.nickname).desc(),
+                *order_by,
+            ]
+
+        seek = None
+        if schema.cursor:
+            if sort is None:
+                raise HTTP400(
+                    detail="The cursor can't be used with this ordering!",
+                )
+
+            try:
+                seek = self.heroes.seek(
+                    schema.cursor,
+                    field=sort.field,
+                    desc=sort.desc,
+                )
+            except (TypeError, ValueError):
+                raise HTTP400(detail="The cursor is invalid!")
+
+        # Raw results are encoded right from Core rows of the needed
+        # columns (the cursor ones included), no ORM instances are built.
+        fields, columns = HeroRetrieve.__fields__, None
+        if schema.fields:
+            fields = [field.value for field in schema.fields]
+        if raw:
+            columns = self.reader.columns(
+                *dict.fromkeys(
+                    [*fields, "uuid", *([sort.field] if sort else [])],
+                ),
+            )
+
+        count, items = await self.reader.select_with_count(
             *filters,
-            order_by=scalar_order_by(schema.order_by),
+            order_by=order_by,
             limit=schema.limit,
-            offset=schema.offset,
+            offset=0 if seek is not None else schema.offset,
+            seek=seek,
+            count_mode=schema.count_mode,
+            columns=columns,
         )
+
+        cursor = None
+        if sort and items and len(items) == schema.limit:
+            cursor = self.heroes.cursor(
+                items[-1],
+                field=sort.field,
+                desc=sort.desc,
+            )
+
+        if raw:
+            # Rows go straight to JSON, no result model is built
+            content = dumps(
+                {
+                    "count": count,
+                    "items": [fields_of(i, fields) for i in items],
+                    "cursor": cursor,
+                },
+            )
+            await self.search_cache.set(key, content)
+
+            return content
+
+        result = HeroSearchResult(count=count, items=items, cursor=cursor)
+        await self.search_cache.set(key, result.json().encode())
+
+        return result
@@ -0,0 +1,21 @@
+from app.cache import GenerationalCache, LRUCache, create_backend
+from app.config import config
+from app.utils.singleflight import SingleFlight
+
+
+heroes_cache = LRUCache(
+    maxsize=config.cache.entity_maxsize,
+    ttl=config.cache.entity_ttl,
+)
+
+heroes_search_cache = GenerationalCache(
+    backend=create_backend(
+        name=config.cache.backend,
+        maxsize=config.cache.search_maxsize,
+        ttl=config.cache.search_ttl,
+        path=config.cache.sqlite_path,
+    ),
+    namespace="hrs_heroes:search",
+)
+
+heroes_flights = SingleFlight()
@@ -1,11 +1,15 @@
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.postgresql.dependencies import get_async_session
+from app.db.postgresql.dependencies import (
+    get_async_read_session,
+    get_async_session,
+)
 from app.modules.heroes.services import HeroServices
 
 
 async def get_hero_services(
     session: AsyncSession = Depends(get_async_session),
+    read_session: AsyncSession = Depends(get_async_read_session),
 ) -> HeroServices:
-    return HeroServices(session=session)
+    return HeroServices(session=session, read_session=read_session)
@@ -1,10 +1,12 @@
 from datetime import datetime
-from typing import Optional
+from typing import Literal, Optional, Union
 from uuid import UUID
 
 from pydantic import BaseModel, Field
 
-from app.types.heroes import RoleType
+from app.config import config
+from app.types.heroes import HeroFieldType, RoleType
+from app.types.search import MatchType
 from app.utils.schemas import BaseInput, BaseOutput, BaseSearch
 
 
@@ -34,21 +36,153 @@ class HeroRetrieve(BaseOutput, HeroBase):
     """Serialisation schema to retrieve hero records."""
 
     uuid: UUID
+    version: int
 
     created_at: datetime
     updated_at: datetime
     deleted_at: Optional[datetime]
 
 
-class HeroSearch(BaseSearch):
-    """Schema to validate hero search parameters."""
+class HeroFilter(BaseModel):
+    """Schema to validate hero filter parameters."""
 
     nickname: Optional[str] = Field(max_length=255)
+    match: MatchType = MatchType.CONTAINS
     role: Optional[RoleType]
 
 
+class HeroSearch(BaseSearch, HeroFilter):
+    """Schema to validate hero search parameters."""
+
+    rank: bool = False
+    fields: Optional[list[HeroFieldType]] = Field(min_items=1)
+
+
 class HeroSearchResult(BaseModel):
     """Schema to serialise search results for heroes."""
 
-    count: int
+    count: Optional[int]
     items: list[HeroRetrieve]
+    cursor: Optional[str]
+
+
+class HeroBulkCreate(BaseModel):
+    """Schema to validate heroes to create at once."""
+
+    items: list[HeroCreate] = Field(
+        min_items=1,
+        max_items=config.app.bulk_max_size,
+    )
+
+
+class HeroBulkItem(BaseModel):
+    """Schema to serialise the outcome of a bulk create item."""
+
+    index: int
+    nickname: str
+    created: bool
+    hero: Optional[HeroRetrieve]
+
+
+class HeroBulkResult(BaseModel):
+    """Schema to serialise the outcome of a bulk create."""
+
+    created: int
+    conflicts: list[str]
+    items: list[HeroBulkItem]
+
+
+class HeroBatchGet(BaseModel):
+    """Schema to validate ids of heroes to retrieve at once."""
+
+    ids: list[UUID] = Field(
+        min_items=1,
+        max_items=config.app.batch_get_max_size,
+    )
+
+
+class HeroBatchResult(BaseModel):
+    """Schema to serialise heroes retrieved at once."""
+
+    items: list[HeroRetrieve]
+    missing: list[UUID]
+
+
+class HeroCreateOperation(BaseModel):
+    """Schema to validate a create operation of a batch."""
+
+    op: Literal["create"]
+    data: HeroCreate
+
+
+class HeroUpdateOperation(BaseModel):
+    """Schema to validate an update operation of a batch."""
+
+    op: Literal["update"]
+    hero_id: UUID
+    data: HeroUpdate
+
+
+class HeroPatchOperation(BaseModel):
+    """Schema to validate a patch operation of a batch."""
+
+    op: Literal["patch"]
+    hero_id: UUID
+    data: HeroPatch
+
+
+class HeroDeleteOperation(BaseModel):
+    """Schema to validate a delete operation of a batch."""
+
+    op: Literal["delete"]
+    hero_id: UUID
+
+
+HeroOperation = Union[
+    HeroCreateOperation,
+    HeroUpdateOperation,
+    HeroPatchOperation,
+    HeroDeleteOperation,
+]
+
+
+class HeroBatch(BaseModel):
+    """Schema to validate operations to run in one transaction."""
+
+    operations: list[HeroOperation] = Field(
+        min_items=1,
+        max_items=config.app.bulk_max_size,
+    )
+
+
+class HeroOperationResult(BaseModel):
+    """Schema to serialise the outcome of a batch operation."""
+
+    index: int
+    op: str
+    hero: Optional[HeroRetrieve]
+
+
+class HeroBatchOperationsResult(BaseModel):
+    """Schema to serialise the outcome of a batch."""
+
+    items: list[HeroOperationResult]
+
+
+class HeroImportError(BaseModel):
+    """Schema to serialise a rejected row of an import."""
+
+    line: int
+    detail: str
+
+
+class HeroImportResult(BaseModel):
+    """Schema to serialise the outcome of an import."""
+
+    rows: int
+    imported: int
+    conflicts: int
+    invalid: int
+    errors: list[HeroImportError]
+    seconds: float
+    rows_per_second: float
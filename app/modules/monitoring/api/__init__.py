@@ -0,0 +1 @@
+from .v1 import admin_router as admin_monitoring_v1
@@ -0,0 +1,74 @@
+from fastapi import APIRouter, Depends, status
+
+from app.db.postgresql.base import database
+from app.db.postgresql.statements import compiled_cache
+from app.modules.auth.api_token import get_api_key
+from app.modules.heroes.services.cache import (
+    heroes_cache,
+    heroes_flights,
+    heroes_search_cache,
+)
+from app.modules.monitoring.schemas import (
+    AllFlightsStats,
+    CachesStats,
+    CompiledCacheStats,
+    PoolStats,
+    ReplicasStats,
+)
+
+
+# |Admin|
+admin_router = APIRouter(prefix="/monitoring", tags=["admin/monitoring"])
+
+
+@admin_router.get(
+    "/caches",
+    response_model=CachesStats,
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(get_api_key)],
+)
+async def get_caches_stats():
+    return {
+        "heroes": heroes_cache.stats(),
+        "heroes_search": await heroes_search_cache.stats(),
+    }
+
+
+@admin_router.get(
+    "/flights",
+    response_model=AllFlightsStats,
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(get_api_key)],
+)
+async def get_flights_stats():
+    return {"heroes": heroes_flights.stats()}
+
+
+@admin_router.get(
+    "/pool",
+    response_model=PoolStats,
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(get_api_key)],
+)
+async def get_pool_stats():
+    return database.engine.pool.stats()
+
+
+@admin_router.get(
+    "/replicas",
+    response_model=ReplicasStats,
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(get_api_key)],
+)
+async def get_replicas_stats():
+    return database.replicas.stats()
+
+
+@admin_router.get(
+    "/compiled-cache",
+    response_model=dict[str, CompiledCacheStats],
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(get_api_key)],
+)
+async def get_compiled_cache_stats():
+    return compiled_cache.stats()
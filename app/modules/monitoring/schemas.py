@@ -0,0 +1,80 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class CacheStats(BaseModel):
+    """Schema to serialise cache usage counters."""
+
+    size: int
+    maxsize: int
+    ttl: Optional[float]
+    hits: int
+    misses: int
+    evictions: int
+
+
+class CachesStats(BaseModel):
+    """Schema to serialise usage counters of application caches."""
+
+    heroes: CacheStats
+    heroes_search: CacheStats
+
+
+class FlightsStats(BaseModel):
+    """Schema to serialise coalescing counters of a single-flight group."""
+
+    calls: int
+    coalesced: int
+    in_flight: int
+
+
+class AllFlightsStats(BaseModel):
+    """Schema to serialise coalescing counters of application reads."""
+
+    heroes: FlightsStats
+
+
+class HistogramStats(BaseModel):
+    """Schema to serialise cumulative histogram counters."""
+
+    buckets: dict[str, int]
+    count: int
+    sum: float
+
+
+class PoolStats(BaseModel):
+    """Schema to serialise database connection pool counters."""
+
+    size: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    max_overflow: int
+    timeouts: int
+    waits: HistogramStats
+
+
+class ReplicaStats(BaseModel):
+    """Schema to serialise health & usage of a read replica."""
+
+    name: str
+    healthy: bool
+    reads: int
+    pool: PoolStats
+
+
+class ReplicasStats(BaseModel):
+    """Schema to serialise read replicas state."""
+
+    failovers: int
+    replicas: list[ReplicaStats]
+
+
+class CompiledCacheStats(BaseModel):
+    """Schema to serialise compiled statement cache usage of a table."""
+
+    hits: int
+    misses: int
+    uncached: int
+    hit_rate: float
@@ -0,0 +1,62 @@
+"""Imports heroes from a NDJSON or CSV file via COPY.
+
+    python -m app.scripts.import_heroes heroes.ndjson
+    python -m app.scripts.import_heroes heroes.csv --chunk-size 50000
+"""
+import argparse
+import asyncio
+import logging
+from pathlib import Path
+from typing import AsyncIterator
+
+from app.config import config
+from app.db.postgresql.base import database
+from app.modules.heroes.services import HeroServices
+from app.types.streams import StreamFormatType
+
+
+async def read_chunks(path: Path, size: int = 1 << 16) -> AsyncIterator[bytes]:
+    with path.open("rb") as file:
+        while chunk := await asyncio.to_thread(file.read, size):
+            yield chunk
+
+
+async def main(path: Path, format_: StreamFormatType, chunk_size: int):
+    async with database.session() as session:
+        result = await HeroServices(session=session).import_(
+            chunks=read_chunks(path),
+            format_=format_,
+            chunk_size=chunk_size,
+        )
+
+    await database.dispose()
+
+    print(result.json(indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path", type=Path)
+    parser.add_argument(
+        "--format",
+        choices=StreamFormatType.values(),
+        help="Defaults to the file extension",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=config.app.import_chunk_size,
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    asyncio.run(
+        main(
+            path=args.path,
+            format_=StreamFormatType(
+                args.format or args.path.suffix.lstrip(".").lower(),
+            ),
+            chunk_size=args.chunk_size,
+        ),
+    )
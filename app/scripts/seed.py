@@ -0,0 +1,194 @@
+"""Seeds the heroes table with synthetic heroes via parallel COPY.
+
+Chunks of heroes are generated & copied by worker processes, each one
+over its own connection:
+
+    python -m app.scripts.seed 1000000
+    python -m app.scripts.seed 5000000 --workers 8 --deleted 0.1
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from functools import partial
+from uuid import uuid4
+
+import asyncpg
+
+from app.config import config
+from app.modules.heroes.crud.models import Hero
+from app.types.heroes import RoleType
+
+
+COLUMNS = (
+    "nickname",
+    "role",
+    "version",
+    "created_at",
+    "updated_at",
+    "deleted_at",
+)
+
+ROLE_WEIGHTS = {
+    RoleType.WARRIOR: 30,
+    RoleType.MAGE: 25,
+    RoleType.ASSASSIN: 20,
+    RoleType.PRIEST: 15,
+    RoleType.TANK: 10,
+}
+
+TITLES = (
+    "Silent Crimson Iron Golden Shadow Storm Frost Wild Black Swift Brave "
+    "Grim Lucky Solar Night"
+).split()
+NAMES = (
+    "Falcon Wolf Blade Star Raven Fang Knight Fox Viper Bear Ghost Hammer "
+    "Arrow Tiger Warden"
+).split()
+
+# Heroes never updated since their creation
+UNTOUCHED = 0.3
+
+
+def generate(
+    start: int,
+    size: int,
+    run: str,
+    deleted: float,
+    days: int,
+    now: datetime,
+) -> list[tuple]:
+    """Generates records of heroes numbered from `start`.
+
+    Nicknames are unique as they end with the run tag & the number.
+    """
+
+    rng = random.Random(f"{run}:{start}")
+    roles = rng.choices(
+        [role.value for role in ROLE_WEIGHTS],
+        weights=list(ROLE_WEIGHTS.values()),
+        k=size,
+    )
+    span = days * 86400
+
+    records = []
+    for number, role in zip(range(start, start + size), roles):
+        created_at = now - timedelta(seconds=rng.random() * span)
+        version, updated_at, deleted_at = 1, created_at, None
+
+        if rng.random() >= UNTOUCHED:
+            version = rng.randint(2, 10)
+            updated_at = created_at + (now - created_at) * rng.random()
+        if rng.random() < deleted:
+            version += 1
+            deleted_at = updated_at = (
+                updated_at + (now - updated_at) * rng.random()
+            )
+
+        records.append(
+            (
+                f"{rng.choice(TITLES)}{rng.choice(NAMES)}_{run}{number:x}",
+                role,
+                version,
+                created_at,
+                updated_at,
+                deleted_at,
+            ),
+        )
+
+    return records
+
+
+async def _copy(dsn: str, records: list[tuple]):
+    connection = await asyncpg.connect(dsn)
+    try:
+        await connection.copy_records_to_table(
+            Hero.__tablename__,
+            records=records,
+            columns=COLUMNS,
+        )
+    finally:
+        await connection.close()
+
+
+def load_chunk(dsn: str, start: int, size: int, **options) -> int:
+    """Generates & copies a chunk of heroes, it runs in a worker process."""
+
+    records = generate(start=start, size=size, **options)
+    asyncio.run(_copy(dsn, records))
+
+    return len(records)
+
+
+async def analyse(dsn: str):
+    connection = await asyncpg.connect(dsn)
+    try:
+        await connection.execute(f"ANALYZE {Hero.__tablename__}")
+    finally:
+        await connection.close()
+
+
+def main(rows: int, chunk_size: int, workers: int, deleted: float, days: int):
+    dsn = config.postgresql.build_using_new_scheme(scheme="postgresql")
+    options = {
+        # Tags nicknames of this run, so reruns don't conflict
+        "run": uuid4().hex[:6],
+        "deleted": deleted,
+        "days": days,
+        "now": datetime.utcnow(),
+    }
+    starts = range(0, rows, chunk_size)
+    sizes = [min(chunk_size, rows - start) for start in starts]
+
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        copied = sum(
+            executor.map(partial(load_chunk, dsn, **options), starts, sizes),
+        )
+    seconds = time.perf_counter() - started
+
+    asyncio.run(analyse(dsn))
+
+    print(
+        json.dumps(
+            {
+                "rows": copied,
+                "workers": workers,
+                "chunk_size": chunk_size,
+                "seconds": round(seconds, 3),
+                "rows_per_minute": round(copied / seconds * 60),
+            },
+            indent=2,
+        ),
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("rows", type=int)
+    parser.add_argument("--chunk-size", type=int, default=50_000)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument(
+        "--deleted",
+        type=float,
+        default=0.05,
+        help="Fraction of soft deleted heroes",
+    )
+    parser.add_argument(
+        "--days",
+        type=int,
+        default=365,
+        help="Heroes are created within this many last days",
+    )
+    args = parser.parse_args()
+
+    main(
+        rows=args.rows,
+        chunk_size=args.chunk_size,
+        workers=args.workers,
+        deleted=args.deleted,
+        days=args.days,
+    )
@@ -19,6 +19,18 @@ class RoleType(BaseEnum):
         return "hrs_roles"
 
 
+class HeroFieldType(BaseEnum):
+    """Enum for hero fields which can be selected."""
+
+    UUID = "uuid"
+    NICKNAME = "nickname"
+    ROLE = "role"
+    VERSION = "version"
+    CREATED_AT = "created_at"
+    UPDATED_AT = "updated_at"
+    DELETED_AT = "deleted_at"
+
+
 # |Events|
 @event.listens_for(Base.metadata, "before_create")
 def _create_enums(metadata, conn, **kwargs):  # noqa: keep parameters
@@ -0,0 +1,18 @@
+from app.types.base import BaseEnum
+
+
+# |Declaration|
+class CountModeType(BaseEnum):
+    """Enum for the way search results are counted."""
+
+    EXACT = "exact"
+    ESTIMATED = "estimated"
+    NONE = "none"
+
+
+class MatchType(BaseEnum):
+    """Enum for the way text fields are matched."""
+
+    CONTAINS = "contains"
+    PREFIX = "prefix"
+    EXACT = "exact"
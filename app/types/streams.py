@@ -0,0 +1,9 @@
+from app.types.base import BaseEnum
+
+
+# |Declaration|
+class StreamFormatType(BaseEnum):
+    """Enum for formats of streamed records."""
+
+    NDJSON = "ndjson"
+    CSV = "csv"
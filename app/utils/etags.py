@@ -0,0 +1,32 @@
+from typing import Optional
+
+
+def make_etag(version: int) -> str:
+    """Builds a strong entity tag out of a record version."""
+
+    return f'"{version}"'
+
+
+def parse_etags(
+    header: Optional[str],
+    weak: bool = False,
+) -> Optional[list[int]]:
+    """Extracts record versions from `If-Match`/`If-None-Match` headers.
+
+    Returns nothing for a missing header or `*` (any version will do),
+    tags which aren't ours are skipped. Weak tags match by the weak
+    comparison (`If-None-Match`) only, otherwise they're skipped too.
+    """
+
+    if header is None or header.strip() == "*":
+        return None
+
+    versions = []
+    for tag in header.split(","):
+        tag = tag.strip()
+        if weak and tag.startswith("W/"):
+            tag = tag[2:]
+        if len(tag) > 2 and tag[0] == tag[-1] == '"' and tag[1:-1].isdigit():
+            versions.append(int(tag[1:-1]))
+
+    return versions
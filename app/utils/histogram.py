@@ -0,0 +1,30 @@
+import bisect
+from typing import Sequence
+
+
+class Histogram:
+    """Counts observed values by upper bounds of buckets.
+
+    Bounds are inclusive, values above the last bound fall into `+Inf`.
+    """
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = sorted(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def stats(self) -> dict:
+        """Returns cumulative counts per bucket like Prometheus does."""
+
+        buckets, total = {}, 0
+        for bound, count in zip([*self.buckets, "+Inf"], self.counts):
+            total += count
+            buckets[str(bound)] = total
+
+        return {"buckets": buckets, "count": self.count, "sum": self.sum}
@@ -0,0 +1,21 @@
+from typing import Any
+
+from fastapi import Response
+
+from app.utils.serialization import dumps
+
+
+class FastJSONResponse(Response):
+    """JSON response encoded with orjson, bytes are sent as they are.
+
+    Returned from a route it bypasses the response model validation, so
+    it's meant for content built by the services themselves.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+
+        return dumps(content)
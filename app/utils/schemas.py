@@ -1,7 +1,10 @@
 from datetime import date, datetime
+from typing import Optional
 
 from pydantic import BaseModel
 
+from app.types.search import CountModeType
+
 
 class BaseInput(BaseModel):
     """Customised pydantic model for input operations."""
@@ -45,6 +48,8 @@ class BaseSearch(BaseModel):
 
     offset: int = 0
     limit: int = 10
+    cursor: Optional[str] = None
+    count_mode: CountModeType = CountModeType.EXACT
 
     order_by: list[OrderByField]
 
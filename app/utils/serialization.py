@@ -0,0 +1,32 @@
+from typing import Any, Iterable, Mapping
+from uuid import UUID
+
+import orjson
+from pydantic import BaseModel
+
+
+def _default(value: Any) -> Any:
+    # Models are trusted to be valid already, so they aren't validated
+    # again, just their values are taken.
+    if isinstance(value, BaseModel):
+        return value.__dict__
+    # asyncpg returns its own UUID subclass, orjson takes only exact ones
+    if isinstance(value, UUID):
+        return str(value)
+
+    raise TypeError(f"Type {type(value)} is not JSON serialisable!")
+
+
+def dumps(value: Any) -> bytes:
+    """Encodes to JSON bytes with orjson."""
+
+    return orjson.dumps(value, default=_default)
+
+
+def fields_of(instance: Any, fields: Iterable[str]) -> dict:
+    """Takes values of the fields from an ORM instance or a row mapping."""
+
+    if isinstance(instance, Mapping):
+        return {field: instance[field] for field in fields}
+
+    return {field: getattr(instance, field) for field in fields}
@@ -0,0 +1,68 @@
+import asyncio
+from typing import Awaitable, Callable, Hashable, TypeVar
+
+
+Result = TypeVar("Result")
+
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key into one execution.
+
+    The first caller of a key runs the call, the ones arriving while it is
+    in flight await and share its result (or exception). If the running
+    call gets cancelled, waiting callers start it over themselves.
+    """
+
+    def __init__(self):
+        self._flights: dict[Hashable, asyncio.Future] = {}
+
+        self.calls = 0
+        self.coalesced = 0
+
+    async def do(
+        self,
+        key: Hashable,
+        fn: Callable[[], Awaitable[Result]],
+    ) -> Result:
+        self.calls += 1
+
+        while (flight := self._flights.get(key)) is not None:
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(flight)
+            except asyncio.CancelledError:
+                if not flight.cancelled():
+                    raise
+
+        flight = asyncio.get_running_loop().create_future()
+        self._flights[key] = flight
+
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            flight.cancel()
+            raise
+        except Exception as e:
+            flight.set_exception(e)
+            # Mark as retrieved, there may be no one else waiting for it
+            flight.exception()
+            raise
+        else:
+            flight.set_result(result)
+            return result
+        finally:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+
+    def forget(self, *keys: Hashable):
+        """Makes next calls of the keys run anew instead of joining."""
+
+        for key in keys:
+            self._flights.pop(key, None)
+
+    def stats(self) -> dict:
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._flights),
+        }
@@ -0,0 +1,122 @@
+import codecs
+import csv
+import io
+import json
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, AsyncIterable, AsyncIterator, Mapping, Sequence
+from uuid import UUID
+
+from app.types.streams import StreamFormatType
+
+
+MEDIA_TYPES = {
+    StreamFormatType.NDJSON: "application/x-ndjson",
+    StreamFormatType.CSV: "text/csv",
+}
+
+
+async def iter_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[str]:
+    """Splits a stream of utf-8 chunks into lines as they arrive."""
+
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+
+    async for chunk in chunks:
+        buffer += decoder.decode(chunk)
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+
+    buffer += decoder.decode(b"", final=True)
+    if buffer:
+        yield buffer.rstrip("\r")
+
+
+async def iter_rows(
+    chunks: AsyncIterable[bytes],
+    format_: StreamFormatType,
+) -> AsyncIterator[tuple[int, dict | ValueError]]:
+    """Parses a NDJSON or CSV (with a header) stream row by row.
+
+    Yields line numbers along with the rows, a malformed line comes as
+    an error instead of breaking the stream. CSV values can't contain
+    line breaks.
+    """
+
+    header = None
+    number = 0
+
+    async for line in iter_lines(chunks):
+        number += 1
+        if not line.strip():
+            continue
+
+        if format_ == StreamFormatType.NDJSON:
+            try:
+                row = json.loads(line)
+            except ValueError as e:
+                yield number, e
+                continue
+
+            if not isinstance(row, dict):
+                yield number, ValueError("The row must be an object!")
+            else:
+                yield number, row
+        elif header is None:
+            header = next(csv.reader([line]))
+        else:
+            values = next(csv.reader([line]))
+            if len(values) != len(header):
+                yield number, ValueError("The row doesn't match the header!")
+            else:
+                yield number, dict(zip(header, values))
+
+
+def _encodable(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, Enum):
+        return value.value
+
+    return value
+
+
+async def encode_rows(
+    partitions: AsyncIterable[Sequence[Mapping]],
+    format_: StreamFormatType,
+    fields: Sequence[str],
+) -> AsyncIterator[bytes]:
+    """Encodes partitions of rows into NDJSON or CSV (with a header).
+
+    Every partition becomes one chunk, so the memory used is bound by the
+    partition size.
+    """
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+
+    if format_ == StreamFormatType.CSV:
+        writer.writerow(fields)
+
+    async for partition in partitions:
+        for row in partition:
+            values = [_encodable(row[field]) for field in fields]
+
+            if format_ == StreamFormatType.NDJSON:
+                buffer.write(
+                    json.dumps(dict(zip(fields, values)), ensure_ascii=False),
+                )
+                buffer.write("\n")
+            else:
+                writer.writerow(values)
+
+        yield buffer.getvalue().encode()
+
+        buffer.seek(0)
+        buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue().encode()
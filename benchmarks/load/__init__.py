@@ -0,0 +1,10 @@
+"""HTTP load benchmark of the hero endpoints.
+
+Seeds heroes, drives every public & admin hero route of `create_app()`
+(in process, or of a running server with `--url`) and reports throughput
+& latency percentiles per endpoint as JSON, two reports can be compared:
+
+    python -m benchmarks.load run --rows 10000 --output before.json
+    python -m benchmarks.load run --rows 10000 --output after.json
+    python -m benchmarks.load compare before.json after.json
+"""
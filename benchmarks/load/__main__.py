@@ -0,0 +1,115 @@
+import argparse
+import asyncio
+import json
+from datetime import datetime
+from typing import Optional
+
+from httpx import AsyncClient
+
+from app.config import config
+from app.db.postgresql.base import database
+from app.entrypoints.main import create_app
+from benchmarks.load import __doc__
+from benchmarks.load.compare import compare
+from benchmarks.load.runner import run_scenario
+from benchmarks.load.scenarios import SCENARIOS, State
+from benchmarks.load.seed import clean, seed
+
+
+async def run(
+    rows: int,
+    requests: int,
+    concurrency: int,
+    endpoints: Optional[list[str]],
+    url: Optional[str],
+    keep: bool,
+) -> dict:
+    started_at = datetime.utcnow()
+    heroes = await seed(database.engine, rows=rows, sample=1000)
+    state = State(heroes)
+
+    # A running server must be connected to the same database
+    client = AsyncClient(
+        app=None if url else create_app(),
+        base_url=url or "http://bench",
+        headers={"access_token": config.security.api_key},
+        timeout=60.0,
+    )
+
+    results = {}
+    try:
+        async with client:
+            for name, scenario in SCENARIOS.items():
+                if endpoints and not name.startswith(tuple(endpoints)):
+                    continue
+
+                results[name] = await run_scenario(
+                    client,
+                    state,
+                    scenario,
+                    requests=requests,
+                    concurrency=concurrency,
+                )
+    finally:
+        if not keep:
+            await clean(database.engine)
+        await database.dispose()
+
+    return {
+        "meta": {
+            "rows": rows,
+            "requests": requests,
+            "concurrency": concurrency,
+            "target": url or "in-process",
+            "started_at": started_at.isoformat(),
+        },
+        "endpoints": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    parser_run = commands.add_parser("run", help="run the benchmark")
+    parser_run.add_argument("--rows", type=int, default=10_000)
+    parser_run.add_argument("--requests", type=int, default=1000)
+    parser_run.add_argument("--concurrency", type=int, default=16)
+    parser_run.add_argument(
+        "--endpoints",
+        nargs="*",
+        help="name prefixes, like public.get or admin",
+    )
+    parser_run.add_argument("--url", help="base url of a running server")
+    parser_run.add_argument("--keep", action="store_true")
+    parser_run.add_argument("--output", help="file to write the report to")
+
+    parser_compare = commands.add_parser("compare", help="compare reports")
+    parser_compare.add_argument("before")
+    parser_compare.add_argument("after")
+
+    args = parser.parse_args()
+
+    if args.command == "run":
+        report = asyncio.run(
+            run(
+                rows=args.rows,
+                requests=args.requests,
+                concurrency=args.concurrency,
+                endpoints=args.endpoints,
+                url=args.url,
+                keep=args.keep,
+            ),
+        )
+        if args.output:
+            with open(args.output, "w") as file:
+                json.dump(report, file, indent=2)
+    else:
+        with open(args.before) as before, open(args.after) as after:
+            report = compare(json.load(before), json.load(after))
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+METRICS = ("rps", "p50_ms", "p95_ms", "p99_ms")
+
+
+def _change(before: float, after: float) -> float:
+    if not before:
+        return 0.0
+
+    return round((after - before) / before * 100, 1)
+
+
+def compare(before: dict, after: dict) -> dict:
+    """Compares endpoints present in both reports, changes are in %.
+
+    Throughput going up & latencies going down are improvements.
+    """
+
+    endpoints = {}
+    for name, was in before["endpoints"].items():
+        now = after["endpoints"].get(name)
+        if now is None:
+            continue
+
+        endpoints[name] = {
+            metric: {
+                "before": was[metric],
+                "after": now[metric],
+                "change_pct": _change(was[metric], now[metric]),
+            }
+            for metric in METRICS
+        }
+        endpoints[name]["errors"] = {
+            "before": was["errors"],
+            "after": now["errors"],
+        }
+
+    return {
+        "before": before["meta"],
+        "after": after["meta"],
+        "endpoints": endpoints,
+    }
@@ -0,0 +1,73 @@
+import asyncio
+import math
+import time
+
+from httpx import AsyncClient, HTTPError
+
+from benchmarks.load.scenarios import Scenario, State
+
+
+def percentile(values: list[float], rank: float) -> float:
+    """Nearest rank percentile of sorted values."""
+
+    if not values:
+        return 0.0
+
+    index = math.ceil(rank / 100 * len(values)) - 1
+
+    return values[max(0, min(len(values) - 1, index))]
+
+
+def summarise(timings: list[float], errors: int, seconds: float) -> dict:
+    timings = sorted(timings)
+
+    return {
+        "requests": len(timings),
+        "errors": errors,
+        "seconds": round(seconds, 3),
+        "rps": round(len(timings) / seconds, 1) if seconds else 0.0,
+        "p50_ms": round(percentile(timings, 50) * 1000, 3),
+        "p95_ms": round(percentile(timings, 95) * 1000, 3),
+        "p99_ms": round(percentile(timings, 99) * 1000, 3),
+    }
+
+
+async def run_scenario(
+    client: AsyncClient,
+    state: State,
+    scenario: Scenario,
+    requests: int,
+    concurrency: int,
+) -> dict:
+    """Sends `requests` requests by `concurrency` workers at once."""
+
+    timings: list[float] = []
+    errors, remaining = 0, requests
+
+    async def worker():
+        nonlocal errors, remaining
+
+        while remaining > 0:
+            remaining -= 1
+
+            request = scenario.build(state)
+            if request is None:
+                return
+
+            started = time.perf_counter()
+            try:
+                response = await client.request(scenario.method, **request)
+            except HTTPError:
+                # Timeouts & connection errors fail the request, not the run
+                response = None
+            timings.append(time.perf_counter() - started)
+
+            if response is None or response.status_code != scenario.status:
+                errors += 1
+            elif scenario.track is not None:
+                scenario.track(state, response.json())
+
+    started = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+
+    return summarise(timings, errors, time.perf_counter() - started)
@@ -0,0 +1,204 @@
+import itertools
+import json
+import random
+from collections import deque
+from typing import Callable, NamedTuple, Optional
+from uuid import uuid4
+
+from app.config import config
+from app.types.heroes import RoleType
+from benchmarks.load.seed import PREFIX
+
+
+PUBLIC = f"{config.prefixes.public}/v1/heroes"
+ADMIN = f"{config.prefixes.admin}/v1/heroes"
+
+ROLES = RoleType.values()
+
+
+class State:
+    """Heroes known to the benchmark, shared by the scenarios."""
+
+    def __init__(self, heroes: list[dict]):
+        self.heroes = heroes
+        # Heroes created by the benchmark are the ones to delete, softly
+        # first, then for good.
+        self.created: deque[str] = deque()
+        self.deleted: deque[str] = deque()
+        self._counter = itertools.count()
+
+    def hero(self) -> dict:
+        return random.choice(self.heroes)
+
+    def ids(self, size: int) -> list[str]:
+        size = min(size, len(self.heroes))
+
+        return [hero["uuid"] for hero in random.sample(self.heroes, size)]
+
+    def nickname(self) -> str:
+        return f"{PREFIX}{next(self._counter)}_{uuid4().hex[:12]}"
+
+    def new_hero(self) -> dict:
+        return {"nickname": self.nickname(), "role": random.choice(ROLES)}
+
+
+class Scenario(NamedTuple):
+    """Builds requests to an endpoint, `None` means nothing to do."""
+
+    method: str
+    build: Callable[[State], Optional[dict]]
+    status: int = 200
+    # Called with the response JSON of successful requests
+    track: Optional[Callable[[State, dict], None]] = None
+
+
+def _created(state: State, body: dict):
+    state.created.append(body["uuid"])
+
+
+def _update(state: State) -> dict:
+    hero = state.hero()
+
+    return {
+        "url": f"{PUBLIC}/{hero['uuid']}",
+        "json": {"nickname": hero["nickname"], "role": random.choice(ROLES)},
+    }
+
+
+def _delete(state: State) -> Optional[dict]:
+    if not state.created:
+        return None
+
+    hero_id = state.created.popleft()
+    state.deleted.append(hero_id)
+
+    return {"url": f"{PUBLIC}/{hero_id}"}
+
+
+def _delete_permanently(state: State) -> Optional[dict]:
+    if not state.deleted:
+        return None
+
+    return {
+        "url": f"{ADMIN}/{state.deleted.popleft()}",
+        "params": {"permanent": "true"},
+    }
+
+
+def _search(state: State) -> dict:
+    # A prefix of an existing nickname, a handful of heroes match it
+    nickname = state.hero()["nickname"][: len(PREFIX) + 3]
+
+    return {
+        "json": {
+            "nickname": nickname,
+            "match": "prefix",
+            "limit": 20,
+            "order_by": [{"field": "nickname", "desc": False}],
+        },
+    }
+
+
+def _import(state: State) -> dict:
+    rows = "\n".join(json.dumps(state.new_hero()) for _ in range(100))
+
+    return {"params": {"format": "ndjson"}, "content": rows.encode()}
+
+
+# Scenarios run in this order, creations go before deletions
+SCENARIOS: dict[str, Scenario] = {
+    "public.create": Scenario(
+        "POST",
+        lambda state: {"url": PUBLIC, "json": state.new_hero()},
+        status=201,
+        track=_created,
+    ),
+    "public.bulk": Scenario(
+        "POST",
+        lambda state: {
+            "url": f"{PUBLIC}/bulk",
+            "json": {"items": [state.new_hero() for _ in range(10)]},
+        },
+    ),
+    "public.batch": Scenario(
+        "POST",
+        lambda state: {
+            "url": f"{PUBLIC}/batch",
+            "json": {
+                "operations": [
+                    {"op": "create", "data": state.new_hero()},
+                    {
+                        "op": "patch",
+                        "hero_id": state.hero()["uuid"],
+                        "data": {"role": random.choice(ROLES)},
+                    },
+                ],
+            },
+        },
+    ),
+    "public.get": Scenario(
+        "GET",
+        lambda state: {"url": f"{PUBLIC}/{state.hero()['uuid']}"},
+    ),
+    "public.batch_get": Scenario(
+        "GET",
+        lambda state: {
+            "url": f"{PUBLIC}/batch-get",
+            "params": {"ids": state.ids(10)},
+        },
+    ),
+    "public.post_batch_get": Scenario(
+        "POST",
+        lambda state: {
+            "url": f"{PUBLIC}/batch-get",
+            "json": {"ids": state.ids(50)},
+        },
+    ),
+    "public.update": Scenario("PUT", _update),
+    "public.patch": Scenario(
+        "PATCH",
+        lambda state: {
+            "url": f"{PUBLIC}/{state.hero()['uuid']}",
+            "json": {"role": random.choice(ROLES)},
+        },
+    ),
+    "public.search": Scenario(
+        "POST",
+        lambda state: {"url": f"{PUBLIC}/search", **_search(state)},
+    ),
+    "public.delete": Scenario("DELETE", _delete),
+    "admin.get": Scenario(
+        "GET",
+        lambda state: {"url": f"{ADMIN}/{state.hero()['uuid']}"},
+    ),
+    "admin.batch_get": Scenario(
+        "GET",
+        lambda state: {
+            "url": f"{ADMIN}/batch-get",
+            "params": {"ids": state.ids(10)},
+        },
+    ),
+    "admin.post_batch_get": Scenario(
+        "POST",
+        lambda state: {
+            "url": f"{ADMIN}/batch-get",
+            "json": {"ids": state.ids(50)},
+        },
+    ),
+    "admin.search": Scenario(
+        "POST",
+        lambda state: {"url": f"{ADMIN}/search", **_search(state)},
+    ),
+    "admin.import": Scenario(
+        "POST",
+        lambda state: {"url": f"{ADMIN}/import", **_import(state)},
+    ),
+    "admin.export": Scenario(
+        "GET",
+        lambda state: {
+            "url": f"{ADMIN}/export",
+            "params": {"nickname": state.hero()["nickname"][:8]},
+        },
+    ),
+    "admin.delete": Scenario("DELETE", _delete_permanently),
+}
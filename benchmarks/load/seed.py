@@ -0,0 +1,47 @@
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.modules.heroes.crud.models import Hero
+from app.types.heroes import RoleType
+
+
+# Every hero made by the benchmark has it, so they can be cleaned up
+PREFIX = "bench_"
+
+
+async def seed(engine: AsyncEngine, rows: int, sample: int) -> list[dict]:
+    """Inserts heroes and returns a random sample of them."""
+
+    async with engine.begin() as conn:
+        await conn.execute(
+            text(
+                f"INSERT INTO {Hero.__tablename__} (nickname, role) "
+                f"SELECT '{PREFIX}' || md5(i::text), "
+                f"(enum_range(NULL::{RoleType.pg_name()}))[1 + i % :roles] "
+                "FROM generate_series(1, :rows) i "
+                "ON CONFLICT DO NOTHING"
+            ),
+            {"rows": rows, "roles": len(RoleType)},
+        )
+        await conn.execute(text(f"ANALYZE {Hero.__tablename__}"))
+
+        results = await conn.execute(
+            text(
+                f"SELECT uuid, nickname FROM {Hero.__tablename__} "
+                "WHERE nickname LIKE :prefix AND deleted_at IS NULL "
+                "ORDER BY random() LIMIT :sample"
+            ),
+            {"sample": sample, "prefix": f"{PREFIX}%"},
+        )
+
+    return [{"uuid": str(r.uuid), "nickname": r.nickname} for r in results]
+
+
+async def clean(engine: AsyncEngine):
+    """Deletes every hero made by the benchmark."""
+
+    async with engine.begin() as conn:
+        await conn.execute(
+            text(f"DELETE FROM {Hero.__tablename__} WHERE nickname LIKE :p"),
+            {"p": f"{PREFIX}%"},
+        )
@@ -0,0 +1,83 @@
+"""Request latency with the metrics middleware & statement hooks on and off.
+
+Sends requests to the app in process (no network involved) for a route
+without queries and for a hero lookup hitting the database, first with
+metrics disabled, then enabled:
+
+    python -m benchmarks.metrics_overhead --requests 2000
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from uuid import uuid4
+
+from httpx import AsyncClient
+
+from app.config import config
+from app.db.postgresql.base import database
+from app.entrypoints.main import create_app
+
+
+async def measure(client: AsyncClient, path: str, requests: int) -> dict:
+    timings = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        await client.get(path)
+        timings.append((time.perf_counter() - started) * 1_000_000)
+
+    return {
+        "p50_us": round(statistics.median(timings), 1),
+        "mean_us": round(statistics.mean(timings), 1),
+    }
+
+
+async def run(metrics: bool, requests: int) -> dict:
+    config.app.metrics = metrics
+    app = create_app()
+
+    paths = {
+        "no_queries": "/health_check",
+        # Missing heroes aren't cached, every lookup runs a statement
+        "hero_lookup": f"{config.prefixes.public}/v1/heroes/{uuid4()}",
+    }
+
+    results = {}
+    async with AsyncClient(app=app, base_url="http://bench") as client:
+        for name, path in paths.items():
+            await measure(client, path, requests=requests // 10)
+            results[name] = await measure(client, path, requests=requests)
+
+    return results
+
+
+async def main(requests: int):
+    off = await run(metrics=False, requests=requests)
+    on = await run(metrics=True, requests=requests)
+
+    await database.dispose()
+
+    overhead = {
+        name: round(on[name]["p50_us"] - off[name]["p50_us"], 1)
+        for name in off
+    }
+    print(
+        json.dumps(
+            {
+                "requests": requests,
+                "off": off,
+                "on": on,
+                "overhead_us": overhead,
+            },
+            indent=2,
+        ),
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    asyncio.run(main(requests=args.requests))
@@ -0,0 +1,132 @@
+"""Nickname search latency with and without the trigram index.
+
+Seeds a scratch copy of the heroes table and times the predicates used by
+`HeroServices.search` for every match mode before and after creating the
+`gin_trgm_ops` index:
+
+    python -m benchmarks.nickname_search --rows 1000000 --repeat 20
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+from sqlalchemy import column, func, select, table, text
+from sqlalchemy.ext.asyncio import AsyncConnection, create_async_engine
+
+from app.config import config
+from app.types.search import MatchType
+
+
+TABLE = "bench_hrs_heroes"
+
+heroes = table(TABLE, column("uuid"), column("nickname"))
+
+STATEMENTS = {
+    MatchType.CONTAINS: lambda value: heroes.c.nickname.icontains(
+        value, autoescape=True
+    ),
+    MatchType.PREFIX: lambda value: heroes.c.nickname.istartswith(
+        value, autoescape=True
+    ),
+    MatchType.EXACT: lambda value: heroes.c.nickname == value,
+}
+
+
+async def seed(conn: AsyncConnection, rows: int):
+    await conn.execute(text(f"DROP TABLE IF EXISTS {TABLE}"))
+    await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    await conn.execute(
+        text(
+            f"CREATE UNLOGGED TABLE {TABLE} ("
+            "uuid uuid PRIMARY KEY DEFAULT gen_random_uuid(), "
+            "nickname varchar(255) NOT NULL UNIQUE)"
+        ),
+    )
+    await conn.execute(
+        text(
+            f"INSERT INTO {TABLE} (nickname) "
+            "SELECT 'hero_' || md5(i::text) FROM generate_series(1, :rows) i"
+        ),
+        {"rows": rows},
+    )
+    await conn.commit()
+    await conn.execute(text(f"ANALYZE {TABLE}"))
+
+
+async def measure(conn: AsyncConnection, repeat: int, value: str) -> dict:
+    results = {}
+
+    for match, predicate in STATEMENTS.items():
+        statement = (
+            select(heroes.c.uuid, heroes.c.nickname)
+            .where(predicate(value[match]))
+            .order_by(heroes.c.nickname)
+            .limit(10)
+        )
+
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            await conn.execute(statement)
+            timings.append((time.perf_counter() - started) * 1000)
+
+        results[match.value] = {
+            "p50_ms": round(statistics.median(timings), 3),
+            "max_ms": round(max(timings), 3),
+        }
+
+    return results
+
+
+async def main(rows: int, repeat: int):
+    engine = create_async_engine(config.postgresql.using_async_driver)
+
+    async with engine.connect() as conn:
+        await seed(conn, rows=rows)
+
+        # Substring & prefix of an existing nickname, selective enough to
+        # return a handful of rows.
+        nickname = await conn.scalar(
+            select(heroes.c.nickname).order_by(func.random()).limit(1),
+        )
+        value = {
+            MatchType.CONTAINS: nickname[10:18],
+            MatchType.PREFIX: nickname[:12].upper(),
+            MatchType.EXACT: nickname,
+        }
+
+        before = await measure(conn, repeat=repeat, value=value)
+
+        await conn.execute(
+            text(
+                f"CREATE INDEX ix__{TABLE}__nickname_trgm ON {TABLE} "
+                "USING gin (nickname gin_trgm_ops)"
+            ),
+        )
+        await conn.execute(text(f"ANALYZE {TABLE}"))
+        await conn.commit()
+
+        after = await measure(conn, repeat=repeat, value=value)
+
+        await conn.execute(text(f"DROP TABLE {TABLE}"))
+        await conn.commit()
+
+    await engine.dispose()
+
+    print(
+        json.dumps(
+            {"rows": rows, "before": before, "after": after},
+            indent=2,
+        ),
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    asyncio.run(main(rows=args.rows, repeat=args.repeat))
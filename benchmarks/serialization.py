@@ -0,0 +1,117 @@
+"""Hero search response encoding with and without the orjson fast path.
+
+Encodes the same page of heroes the way a search route does, through the
+response model (validation, `jsonable_encoder`, `json.dumps`) and through
+`app.utils.serialization` straight from the rows:
+
+    python -m benchmarks.serialization --items 100 --repeat 1000
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from datetime import datetime
+from uuid import uuid4
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute, serialize_response
+
+from app.modules.heroes.crud.models import Hero
+from app.modules.heroes.services.schemas import HeroRetrieve, HeroSearchResult
+from app.types.heroes import RoleType
+from app.utils.responses import FastJSONResponse
+from app.utils.serialization import dumps, fields_of
+
+
+def make_heroes(items: int) -> list[Hero]:
+    roles = list(RoleType)
+    now = datetime.utcnow()
+
+    return [
+        Hero(
+            uuid=uuid4(),
+            nickname=f"hero_{i}",
+            role=roles[i % len(roles)].value,
+            version=1,
+            created_at=now,
+            updated_at=now,
+            deleted_at=None,
+        )
+        for i in range(items)
+    ]
+
+
+async def model_path(field, heroes: list[Hero]) -> bytes:
+    result = HeroSearchResult(count=len(heroes), items=heroes, cursor=None)
+    content = await serialize_response(field=field, response_content=result)
+
+    return JSONResponse(content=content).body
+
+
+async def fast_path(field, heroes: list[Hero]) -> bytes:
+    content = dumps(
+        {
+            "count": len(heroes),
+            "items": [
+                fields_of(hero, HeroRetrieve.__fields__) for hero in heroes
+            ],
+            "cursor": None,
+        },
+    )
+
+    return FastJSONResponse(content=content).body
+
+
+async def measure(encode, field, heroes: list[Hero], repeat: int) -> dict:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        body = await encode(field, heroes)
+        timings.append((time.perf_counter() - started) * 1000)
+
+    return {
+        "p50_ms": round(statistics.median(timings), 4),
+        "max_ms": round(max(timings), 4),
+        "bytes": len(body),
+    }
+
+
+async def main(items: int, repeat: int):
+    # The cloned response field is what FastAPI validates search results by
+    route = APIRoute(
+        "/search",
+        endpoint=lambda: None,
+        response_model=HeroSearchResult,
+    )
+    field = route.secure_cloned_response_field
+    heroes = make_heroes(items)
+
+    # Both paths must give the same document
+    assert json.loads(await model_path(field, heroes)) == json.loads(
+        await fast_path(field, heroes),
+    )
+
+    model = await measure(model_path, field, heroes, repeat=repeat)
+    fast = await measure(fast_path, field, heroes, repeat=repeat)
+
+    print(
+        json.dumps(
+            {
+                "items": items,
+                "model": model,
+                "fast": fast,
+                "speedup": round(model["p50_ms"] / fast["p50_ms"], 2),
+            },
+            indent=2,
+        ),
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=1000)
+    args = parser.parse_args()
+
+    asyncio.run(main(items=args.items, repeat=args.repeat))
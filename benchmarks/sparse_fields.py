@@ -0,0 +1,113 @@
+"""Hero page reads through the ORM and through Core rows.
+
+Seeds heroes within a transaction (rolled back in the end) and times the
+reads of a page the way `HeroServices.search` does: ORM entities of the
+whole table, Core mappings of all the columns and Core mappings of a
+sparse fieldset. Every read is encoded to JSON, peak memory allocated by
+a read is traced separately:
+
+    python -m benchmarks.sparse_fields --rows 1000 --repeat 50
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+import tracemalloc
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.config import config
+from app.modules.heroes.crud import HeroCRUD
+from app.modules.heroes.crud.models import Hero
+from app.modules.heroes.services.schemas import HeroRetrieve
+from app.utils.serialization import dumps, fields_of
+
+
+FIELDS = {
+    "orm": None,
+    "core": list(HeroRetrieve.__fields__),
+    "core_sparse": ["uuid", "nickname"],
+}
+
+
+async def seed(session: AsyncSession, rows: int):
+    await session.execute(
+        text(
+            f"INSERT INTO {Hero.__tablename__} (nickname, role) "
+            "SELECT 'bench_' || md5(i::text), 'mage' "
+            "FROM generate_series(1, :rows) i"
+        ),
+        {"rows": rows},
+    )
+
+
+async def read(session: AsyncSession, fields: list[str] | None, rows: int):
+    crud = HeroCRUD(session=session)
+    columns = None if fields is None else crud.columns(*fields)
+
+    items = await crud.select(
+        order_by=crud.seek_order_by("created_at"),
+        limit=rows,
+        columns=columns,
+    )
+    body = dumps(
+        [fields_of(item, fields or HeroRetrieve.__fields__) for item in items],
+    )
+    # ORM entities would be reused from the identity map by the next read
+    session.expunge_all()
+
+    return body
+
+
+async def measure(
+    session: AsyncSession,
+    fields: list[str] | None,
+    rows: int,
+    repeat: int,
+) -> dict:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        body = await read(session, fields=fields, rows=rows)
+        timings.append((time.perf_counter() - started) * 1000)
+
+    tracemalloc.start()
+    await read(session, fields=fields, rows=rows)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "p50_ms": round(statistics.median(timings), 3),
+        "max_ms": round(max(timings), 3),
+        "peak_kib": round(peak / 1024, 1),
+        "bytes": len(body),
+    }
+
+
+async def main(rows: int, repeat: int):
+    engine = create_async_engine(config.postgresql.using_async_driver)
+
+    async with AsyncSession(engine) as session:
+        await seed(session, rows=rows)
+
+        results = {
+            name: await measure(session, fields, rows=rows, repeat=repeat)
+            for name, fields in FIELDS.items()
+        }
+
+        await session.rollback()
+
+    await engine.dispose()
+
+    print(json.dumps({"rows": rows, **results}, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    asyncio.run(main(rows=args.rows, repeat=args.repeat))
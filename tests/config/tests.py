@@ -0,0 +1,37 @@
+import pytest
+from pydantic import ValidationError
+
+from app.config.base import AppSettings, Config, PostgreSQL
+
+
+class TestConfig:
+    """Tests for app config."""
+
+    # |Tests|
+    @pytest.mark.parametrize(
+        "budget,workers,want",
+        [(0, 4, (5, 10)), (40, 4, (5, 5)), (12, 4, (3, 0)), (4, 4, (1, 0))],
+    )
+    def test_pool_limits(self, budget: int, workers: int, want: tuple):
+        settings = PostgreSQL(
+            pool_size=5,
+            max_overflow=10,
+            connection_budget=budget,
+        )
+
+        assert settings.pool_limits(workers=workers) == want
+
+    def test_pool_limits_over_budget(self):
+        settings = PostgreSQL(connection_budget=2)
+
+        with pytest.raises(ValueError):
+            settings.pool_limits(workers=4)
+
+        with pytest.raises(ValidationError):
+            Config(
+                app=AppSettings(workers=4),
+                prefixes={},
+                postgresql=settings,
+                security={},
+                cache={},
+            )
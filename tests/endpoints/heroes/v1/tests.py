@@ -1,13 +1,34 @@
+import asyncio
+import csv
+import io
+import json
+from contextlib import asynccontextmanager
 from datetime import datetime
 
 import pytest
 import pytest_asyncio
+from fastapi import HTTPException
 from httpx import AsyncClient
-from sqlalchemy import select
+from sqlalchemy import delete, func, insert, select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.cache import create_backend
+from app.config import config
+from app.db.postgresql import dependencies
+from app.db.postgresql.base import Database
+from app.db.postgresql.loaders import BatchLoader
+from app.db.postgresql.replicas import ReplicaSet
+from app.modules.heroes.crud import HeroCRUD
 from app.modules.heroes.crud.models import Hero
+from app.modules.heroes.services import HeroServices
+from app.modules.heroes.services.cache import (
+    heroes_cache,
+    heroes_flights,
+    heroes_search_cache,
+)
+from app.modules.heroes.services.schemas import HeroRetrieve
 from tests.utils.assertions import assert_response
+from tests.utils.queries import assert_max_queries, count_queries
 
 
 class TestHero:
@@ -43,6 +64,111 @@ class TestHero:
 
         assert hero
 
+    @pytest.mark.asyncio
+    async def test_create_bulk(
+        self,
+        _async_client: "AsyncClient",
+        _async_session: "AsyncSession",
+        _hero: "Hero",
+        _test_data: dict,
+    ):
+        payload = _test_data["cases"]["create_bulk"]["payload"]
+        want = _test_data["cases"]["create_bulk"]["want"]
+
+        with count_queries(_async_session) as statements:
+            response = await _async_client.post(
+                f"{self.base_url}/heroes/bulk",
+                json=payload,
+            )
+
+        assert response.status_code == 200
+        assert len(statements) == want["queries"]
+
+        got = response.json()
+
+        assert got["created"] == want["created"]
+        assert got["conflicts"] == want["conflicts"]
+        assert [i["created"] for i in got["items"]] == want["items"]
+
+        for item, sent in zip(got["items"], payload["items"]):
+            if item["created"]:
+                assert_response(got=item["hero"], want=sent)
+
+        response = await _async_client.post(
+            f"{self.base_url}/heroes/bulk",
+            json={"items": []},
+        )
+
+        assert response.status_code == 422
+
+    @pytest.mark.asyncio
+    async def test_batch(
+        self,
+        _async_client: "AsyncClient",
+        _async_session: "AsyncSession",
+        _heroes: list["Hero"],
+        _test_data: dict,
+    ):
+        case = _test_data["cases"]["batch"]
+
+        operations = []
+        for operation in case["operations"]:
+            operation = dict(operation)
+            if "hero" in operation:
+                operation["hero_id"] = str(_heroes[operation.pop("hero")].uuid)
+            operations.append(operation)
+
+        with count_queries(_async_session) as statements:
+            response = await _async_client.post(
+                f"{self.base_url}/heroes/batch",
+                json={"operations": operations},
+            )
+
+        assert response.status_code == 200
+        assert len(statements) == case["want"]["queries"]
+
+        got = response.json()
+
+        assert_response(got=got, want={"items": case["want"]["items"]})
+
+    @pytest.mark.asyncio
+    async def test_batch_failed(
+        self,
+        _async_client: "AsyncClient",
+        _async_session: "AsyncSession",
+        _test_data: dict,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        case = _test_data["cases"]["batch_failed"]
+
+        response = await _async_client.post(
+            f"{self.base_url}/heroes/batch",
+            json={"operations": case["operations"]},
+        )
+
+        assert response.status_code == 404
+        assert_response(got=response.json(), want=case["want"])
+
+        nickname = case["operations"][0]["data"]["nickname"]
+        statement = select(Hero).where(Hero.nickname == nickname)
+        results = await _async_session.execute(statement=statement)
+
+        assert results.scalar_one_or_none() is None
+
+        # Plain HTTP errors keep their status too
+        async def conflict(*args, **kwargs):
+            raise HTTPException(status_code=409, detail="Conflict")
+
+        monkeypatch.setattr(HeroServices, "_run", conflict)
+
+        response = await _async_client.post(
+            f"{self.base_url}/heroes/batch",
+            json={"operations": case["operations"]},
+        )
+
+        assert response.status_code == 409
+        assert response.json()["detail"]["detail"] == "Conflict"
+
     @pytest.mark.asyncio
     async def test_get(
         self,
@@ -68,6 +194,433 @@ class TestHero:
 
         assert hero
 
+    @pytest.mark.asyncio
+    async def test_get_cached(
+        self,
+        _async_client: "AsyncClient",
+        _async_session: "AsyncSession",
+        _hero: "Hero",
+        _test_data: dict,
+    ):
+        want = _test_data["cases"]["get_cached"]["want"]
+
+        responses = []
+        hits = heroes_cache.hits
+        for _ in range(2):
+            responses.append(
+                await _async_client.get(
+                    f"{self.base_url}/heroes/{_hero.uuid}",
+                ),
+            )
+
+        assert [r.status_code for r in responses] == [200, 200]
+        assert responses[0].json() == responses[1].json()
+        assert heroes_cache.hits - hits == want["hits"]
+
+        response = await _async_client.put(
+            f"{self.base_url}/heroes/{_hero.uuid}",
+            json=_test_data["cases"]["update"]["payload"],
+        )
+
+        assert response.status_code == 200
+
+        response = await _async_client.get(
+            f"{self.base_url}/heroes/{_hero.uuid}",
+        )
+
+        assert response.status_code == 200
+
+        got = response.json()
+        want = _test_data["cases"]["update"]["want"]
+
+        assert_response(got=got, want=want)
+
+    @pytest.mark.asyncio
+    async def test_get_cached_write_race(
+        self,
+        _async_session: "AsyncSession",
+        _hero: "Hero",
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        services = HeroServices(session=_async_session, loader=None)
+        key = services._key(_hero.uuid, as_staff=False)
+        select_one = services.reader.select
+
+        async def racing_select(*args, **kwargs):
+            instance = await select_one(*args, **kwargs)
+            # A write drops the entry while the read is in flight
+            heroes_cache.delete(key)
+            return instance
+
+        monkeypatch.setattr(services.reader, "select", racing_select)
+
+        hero = await services.get(_hero.uuid)
+
+        assert hero.uuid == _hero.uuid
+        assert heroes_cache.get(key) is None
+
+        monkeypatch.undo()
+        await services.get(_hero.uuid)
+
+        assert heroes_cache.get(key) is not None
+
+    @pytest.mark.asyncio
+    async def test_get_coalesced(
+        self,
+        _async_client: "AsyncClient",
+        _async_session: "AsyncSession",
+        _hero: "Hero",
+        _test_data: dict,
+    ):
+        case = _test_data["cases"]["get_coalesced"]
+
+        coalesced = heroes_flights.coalesced
+        responses = await asyncio.gather(
+            *[
+                _async_client.get(f"{self.base_url}/heroes/{_hero.uuid}")
+                for _ in range(case["requests"])
+            ],
+        )
+
+        assert all(r.status_code == 200 for r in responses)
+        assert (
+            heroes_flights.coalesced - coalesced == case["want"]["coalesced"]
+        )
+
+    @pytest.mark.asyncio
+    async def test_batch_get(
+        self,
+        _async_client: "AsyncClient",
+        _async_session: "AsyncSession",
+        _heroes: list["Hero"],
+        _test_data: dict,
+    ):
+        case = _test_data["cases"]["batch_get"]
+        ids = [str(hero.uuid) for hero in _heroes] + [case["missing"]]
+
+        responses = [
+            await _async_client.get(
+                f"{self.base_url}/heroes/batch-get",
+                params={"ids": ids},
+            ),
+            await _async_client.post(
+                f"{self.base_url}/heroes/batch-get",
+                json={"ids": ids},
+            ),
+        ]
+
+        for response in responses:
+            assert response.status_code == 200
+
+            got = response.json()
+
+            assert [i["uuid"] for i in got["items"]] == ids[:-1]
+            assert len(got["items"]) == case["want"]["items"]
+            assert got["missing"] == case["want"]["missing"]
+
+    @pytest.mark.asyncio
+    async def test_batch_loader(
+        self,
+        _async_session: "AsyncSession",
+        _heroes: list["Hero"],
+        _test_data: dict,
+    ):
+        want = _test_data["cases"]["batch_loader"]["want"]
+
+        @asynccontextmanager
+        async def session_factory():
+            yield _async_session
+
+        loader = BatchLoader(crud=HeroCRUD, session_factory=session_factory)
+
+        with count_queries(_async_session) as statements:
+            got = await asyncio.gather(
+                *[loader.load(hero.uuid) for hero in _heroes],
+                loader.load(_heroes[0].uuid),
+            )
+
+        assert len(statements) == want["queries"]
+        assert got[:-1] == _heroes
+        assert got[-1] is _heroes[0]
+
+    @pytest.mark.asyncio
+    async def test_read_replicas(
+        self,
+        _async_client: "AsyncClient",
+        _hero: "Hero",
+        _test_data: dict,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        case = _test_data["cases"]["read_replicas"]
+
+        # The replica runs its own connection, so it doesn't see the test
+        # transaction, just like a replica lagging behind the primary.
+        replicas = ReplicaSet(
+            dsns=[case["down"], config.postgresql.using_async_driver_for_test],
+            check_interval=60,
+        )
+        monkeypatch.setattr(dependencies.database, "_replicas", replicas)
+        monkeypatch.setattr(config.postgresql, "read_your_writes", 60)
+
+        try:
+            response = await _async_client.get(
+                f"{self.base_url}/heroes/{_hero.uuid}",
+            )
+
+            assert response.status_code == 404
+
+            stats = replicas.stats()
+
+            assert [r["healthy"] for r in stats["replicas"]] == [False, True]
+            assert [r["reads"] for r in stats["replicas"]] == [0, 1]
+
+            response = await _async_client.patch(
+                f"{self.base_url}/heroes/{_hero.uuid}",
+                json=case["payload"],
+            )
+
+            assert response.status_code == 200
+            assert dependencies.PIN_COOKIE in response.cookies
+
+            response = await _async_client.get(
+                f"{self.base_url}/heroes/{_hero.uuid}",
+            )
+
+            assert response.status_code == 200
+            assert_response(got=response.json(), want=case["want"])
+        finally:
+            await replicas.dispose()
+
+        # Without a healthy replica reads fail over to the primary
+        replicas = ReplicaSet(dsns=[case["down"]], check_interval=60)
+        monkeypatch.setattr(dependencies.database, "_replicas", replicas)
+        _async_client.cookies.clear()
+
+        try:
+            response = await _async_client.get(
+                f"{self.base_url}/heroes/{_hero.uuid}",
+            )
+        finally:
+            await replicas.dispose()
+
+        assert response.status_code == 200
+        assert replicas.stats()["failovers"] == 1
+
+    @pytest.mark.asyncio
+    async def test_batch_loader_replicas(
+        self,
+        _async_session: "AsyncSession",
+        _hero: "Hero",
+        _test_data: dict,
+    ):
+        case = _test_data["cases"]["read_replicas"]
+
+        database = Database(
+            settings=config.postgresql.copy(
+                update={"dsn": config.postgresql.using_async_driver_for_test},
+            ),
+        )
+        database._replicas = ReplicaSet(
+            dsns=[case["down"], config.postgresql.using_async_driver_for_test],
+            check_interval=60,
+        )
+
+        @asynccontextmanager
+        async def session_factory():
+            yield _async_session
+
+        loader = BatchLoader(crud=HeroCRUD, session_factory=session_factory)
+        replica_loader = BatchLoader(
+            crud=HeroCRUD,
+            session_factory=database.read_session,
+        )
+
+        try:
+            # A replica read is batched on a healthy replica, which
+            # doesn't see the test transaction yet
+            async with database.replicas.replicas[1].SessionFactory() as read:
+                services = HeroServices(
+                    session=_async_session,
+                    read_session=read,
+                    loader=loader,
+                    replica_loader=replica_loader,
+                )
+
+                hero = await services.get(_hero.uuid, _one_or_none=True)
+
+                assert hero is None
+
+            stats = database.replicas.stats()
+
+            assert [r["reads"] for r in stats["replicas"]] == [0, 1]
+            assert (loader.loads, replica_loader.loads) == (0, 1)
+
+            # Reads of clients pinned to the primary are batched on it
+            services = HeroServices(
+                session=_async_session,
+                loader=loader,
+                replica_loader=replica_loader,
+            )
+            hero = await services.get(_hero.uuid)
+
+            assert hero.uuid == _hero.uuid
+            assert (loader.loads, replica_loader.loads) == (1, 1)
+
+            # Without a healthy replica batches fail over to the primary
+            await database.replicas.dispose()
+            database._replicas = ReplicaSet(
+                dsns=[case["down"]],
+                check_interval=60,
+            )
+
+            async with database.read_session() as session:
+                assert session.bind is database.engine
+
+            assert database.replicas.stats()["failovers"] == 1
+        finally:
+            await database.dispose()
+
+    @pytest.mark.asyncio
+    async def test_read_your_writes_cached(
+        self,
+        _async_client: "AsyncClient",
+        _async_session: "AsyncSession",
+        _test_data: dict,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        case = _test_data["cases"]["read_your_writes"]
+
+        replicas = ReplicaSet(
+            dsns=[config.postgresql.using_async_driver_for_test],
+            check_interval=60,
+        )
+        monkeypatch.setattr(dependencies.database, "_replicas", replicas)
+        monkeypatch.setattr(config.postgresql, "read_your_writes", 60)
+
+        # Committed, so the replica has the hero, though not its update
+        engine = replicas.replicas[0].engine
+        async with engine.begin() as conn:
+            hero_id = await conn.scalar(
+                insert(Hero).values(**case["hero"]).returning(Hero.uuid),
+            )
+
+        try:
+            response = await _async_client.patch(
+                f"{self.base_url}/heroes/{hero_id}",
+                json=case["payload"],
+            )
+
+            assert response.status_code == 200
+            assert dependencies.PIN_COOKIE in response.cookies
+
+            # Another client caches the stale hero read from the replica
+            _async_client.cookies.clear()
+            response = await _async_client.get(
+                f"{self.base_url}/heroes/{hero_id}",
+            )
+
+            assert response.status_code == 200
+            assert_response(got=response.json(), want=case["stale"])
+
+            response = await _async_client.get(
+                f"{self.base_url}/heroes/{hero_id}",
+                cookies={dependencies.PIN_COOKIE: "1"},
+            )
+
+            assert response.status_code == 200
+            assert_response(got=response.json(), want=case["want"])
+        finally:
+            # The update holds the row lock until it's rolled back
+            await _async_session.rollback()
+            async with engine.begin() as conn:
+                await conn.execute(delete(Hero).where(Hero.uuid == hero_id))
+            await replicas.dispose()
+
+    @pytest.mark.asyncio
+    async def test_conditional_requests(
+        self,
+        _async_client: "AsyncClient",
+        _async_session: "AsyncSession",
+        _hero: "Hero",
+        _test_data: dict,
+    ):
+        case = _test_data["cases"]["conditional"]
+        etags = case["etags"]
+        url = f"{self.base_url}/heroes/{_hero.uuid}"
+
+        response = await _async_client.get(url)
+
+        assert response.status_code == 200
+        assert response.headers["etag"] == etags["initial"]
+
+        # Not modified is answered by the version, the hero isn't loaded
+        heroes_cache.clear()
+        with count_queries(_async_session) as statements:
+            response = await _async_client.get(
+                url,
+                headers={"If-None-Match": etags["initial"]},
+            )
+
+        assert response.status_code == 304
+        assert response.headers["etag"] == etags["initial"]
+        assert len(statements) == 1
+        assert "hrs_heroes.nickname" not in statements[0]
+
+        # Weak tags match by the weak comparison of If-None-Match
+        response = await _async_client.get(
+            url,
+            headers={"If-None-Match": f"W/{etags['initial']}"},
+        )
+
+        assert response.status_code == 304
+
+        response = await _async_client.patch(
+            url,
+            json=case["payload"],
+            headers={"If-Match": etags["stale"]},
+        )
+
+        assert response.status_code == 412
+        assert_response(got=response.json(), want=case["want"])
+
+        response = await _async_client.patch(
+            url,
+            json=case["payload"],
+            headers={"If-Match": etags["initial"]},
+        )
+
+        assert response.status_code == 200
+        assert response.headers["etag"] == etags["patched"]
+
+        response = await _async_client.get(
+            url,
+            headers={"If-None-Match": etags["initial"]},
+        )
+
+        assert response.status_code == 200
+
+        response = await _async_client.delete(
+            url,
+            headers={"If-Match": etags["initial"]},
+        )
+
+        assert response.status_code == 412
+
+        # ...but If-Match compares strongly
+        response = await _async_client.delete(
+            url,
+            headers={"If-Match": f"W/{etags['patched']}"},
+        )
+
+        assert response.status_code == 412
+
+        response = await _async_client.delete(
+            url,
+            headers={"If-Match": etags["patched"]},
+        )
+
+        assert response.status_code == 200
+
     @pytest.mark.asyncio
     async def test_update(
         self,
@@ -124,6 +677,84 @@ class TestHero:
 
         assert hero
 
+    @pytest.mark.asyncio
+    async def test_write_queries(
+        self,
+        _async_client: "AsyncClient",
+        _async_session: "AsyncSession",
+        _hero: "Hero",
+        _test_data: dict,
+    ):
+        case = _test_data["cases"]["write_queries"]
+
+        for request in case["requests"]:
+            path = request["path"].format(uuid=_hero.uuid)
+
+            with count_queries(_async_session) as statements:
+                response = await _async_client.request(
+                    request["method"],
+                    f"{self.base_url}/heroes{path}",
+                    json=request["payload"],
+                )
+
+            assert response.status_code == request["status"]
+            assert len(statements) == case["want"]["queries"]
+
+            got = response.json()
+
+            assert_response(got=got, want=request["want"])
+
+    @pytest.mark.asyncio
+    async def test_read_queries(
+        self,
+        _async_client: "AsyncClient",
+        _async_session: "AsyncSession",
+        _hero: "Hero",
+        _test_data: dict,
+    ):
+        for request in _test_data["cases"]["read_queries"]["requests"]:
+            path = request["path"].format(uuid=_hero.uuid)
+
+            with assert_max_queries(_async_session, request["max_queries"]):
+                response = await _async_client.request(
+                    request["method"],
+                    f"{self.base_url}/heroes{path}",
+                    json=request["payload"],
+                )
+
+            assert response.status_code == 200
+
+    @pytest.mark.asyncio
+    async def test_query_stats(
+        self,
+        _async_client: "AsyncClient",
+        _async_session: "AsyncSession",
+        _hero: "Hero",
+        _test_data: dict,
+        monkeypatch: pytest.MonkeyPatch,
+        caplog: pytest.LogCaptureFixture,
+    ):
+        case = _test_data["cases"]["query_stats"]
+
+        monkeypatch.setattr(config.app, "debug", True)
+        monkeypatch.setattr(config.postgresql, "slow_query_threshold", 1e-9)
+
+        with caplog.at_level("WARNING"):
+            response = await _async_client.post(
+                f"{self.base_url}/heroes/search",
+                json=case["payload"],
+            )
+
+        assert response.status_code == 200
+        assert response.headers["X-DB-Queries"] == "1"
+        assert float(response.headers["X-DB-Time"]) > 0
+
+        messages = [record.getMessage() for record in caplog.records]
+
+        assert any(m.startswith("Slow statement") for m in messages)
+        # Parameters are logged by type only
+        assert not any(case["payload"]["nickname"] in m for m in messages)
+
     @pytest.mark.asyncio
     async def test_delete(
         self,
@@ -150,6 +781,30 @@ class TestHero:
         assert hero
         assert hero.deleted_at is not None
 
+    @pytest.mark.asyncio
+    async def test_delete_not_found(
+        self,
+        _async_client: "AsyncClient",
+        _async_session: "AsyncSession",
+        _hero: "Hero",
+        _test_data: dict,
+    ):
+        case = _test_data["cases"]["delete_not_found"]
+
+        response = await _async_client.delete(
+            f"{self.base_url}/heroes/{_hero.uuid}",
+        )
+
+        assert response.status_code == 200
+
+        for hero_id in (_hero.uuid, case["missing"]):
+            response = await _async_client.delete(
+                f"{self.base_url}/heroes/{hero_id}",
+            )
+
+            assert response.status_code == 404
+            assert_response(got=response.json(), want=case["want"])
+
     @pytest.mark.asyncio
     async def test_search(
         self,
@@ -194,6 +849,274 @@ class TestHero:
 
         assert_response(got=got, want=want)
 
+    @pytest.mark.asyncio
+    async def test_search_keyset(
+        self,
+        _async_client: "AsyncClient",
+        _async_session: "AsyncSession",
+        _heroes: list["Hero"],
+        _test_data: dict,
+    ):
+        payload = _test_data["cases"]["search_keyset"]["payload"]
+        want = _test_data["cases"]["search_keyset"]["want"]
+
+        pages, uuids, cursor = 0, [], None
+        while True:
+            response = await _async_client.post(
+                f"{self.base_url}/heroes/search",
+                json={**payload, "cursor": cursor},
+            )
+
+            assert response.status_code == 200
+
+            got = response.json()
+            pages += 1
+            uuids.extend(item["uuid"] for item in got["items"])
+
+            assert got["count"] == want["count"]
+
+            cursor = got["cursor"]
+            if cursor is None:
+                break
+
+        assert pages == want["pages"]
+        assert len(uuids) == len(set(uuids)) == want["count"]
+
+    @pytest.mark.asyncio
+    async def test_search_count_modes(
+        self,
+        _async_client: "AsyncClient",
+        _async_session: "AsyncSession",
+        _heroes: list["Hero"],
+        _test_data: dict,
+    ):
+        payload = _test_data["cases"]["search_count_modes"]["payload"]
+        want = _test_data["cases"]["search_count_modes"]["want"]
+
+        got = {}
+        for count_mode in ("exact", "estimated", "none"):
+            response = await _async_client.post(
+                f"{self.base_url}/heroes/search",
+                json={**payload, "count_mode": count_mode},
+            )
+
+            assert response.status_code == 200
+            assert len(response.json()["items"]) == payload["limit"]
+
+            got[count_mode] = response.json()["count"]
+
+        assert got["exact"] == want["exact"]
+        assert got["none"] == want["none"]
+        assert isinstance(got["estimated"], int)
+
+    @pytest.mark.asyncio
+    async def test_search_match(
+        self,
+        _async_client: "AsyncClient",
+        _async_session: "AsyncSession",
+        _heroes: list["Hero"],
+        _test_data: dict,
+    ):
+        for case in _test_data["cases"]["search_match"]:
+            response = await _async_client.post(
+                f"{self.base_url}/heroes/search",
+                json=case["payload"],
+            )
+
+            assert response.status_code == 200
+
+            assert_response(got=response.json(), want=case["want"])
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("backend", ["memory", "sqlite"])
+    async def test_search_cached(
+        self,
+        _async_client: "AsyncClient",
+        _async_session: "AsyncSession",
+        _heroes: list["Hero"],
+        _test_data: dict,
+        backend: str,
+        monkeypatch: pytest.MonkeyPatch,
+        tmp_path,
+    ):
+        monkeypatch.setattr(
+            heroes_search_cache,
+            "backend",
+            create_backend(name=backend, path=str(tmp_path / "cache")),
+        )
+
+        payload = _test_data["cases"]["search_cached"]["payload"]
+        want = _test_data["cases"]["search_cached"]["want"]
+
+        responses = []
+        hits = heroes_search_cache.hits
+        for _ in range(2):
+            responses.append(
+                await _async_client.post(
+                    f"{self.base_url}/heroes/search",
+                    json=payload,
+                ),
+            )
+
+        assert [r.status_code for r in responses] == [200, 200]
+        assert responses[0].json() == responses[1].json()
+        assert responses[1].json()["count"] == want["count"]
+        assert heroes_search_cache.hits - hits == want["hits"]
+
+        response = await _async_client.post(
+            f"{self.base_url}/heroes",
+            json=_test_data["cases"]["search_cached"]["create"],
+        )
+
+        assert response.status_code == 201
+
+        response = await _async_client.post(
+            f"{self.base_url}/heroes/search",
+            json=payload,
+        )
+
+        assert response.status_code == 200
+        assert response.json()["count"] == want["count_after_create"]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "case",
+        [
+            "search_invalid_cursor",
+            "search_cursor_wrong_type",
+            "search_cursor_wrong_type_date",
+        ],
+    )
+    async def test_search_invalid_cursor(
+        self,
+        _async_client: "AsyncClient",
+        _async_session: "AsyncSession",
+        _hero: "Hero",
+        _test_data: dict,
+        case: str,
+    ):
+        payload = _test_data["cases"][case]["payload"]
+
+        response = await _async_client.post(
+            f"{self.base_url}/heroes/search",
+            json=payload,
+        )
+
+        assert response.status_code == 400
+
+        got = response.json()
+        want = _test_data["cases"][case]["want"]
+
+        assert_response(got=got, want=want)
+
+    @pytest.mark.asyncio
+    async def test_search_order_by_not_allowed(
+        self,
+        _async_client: "AsyncClient",
+        _async_session: "AsyncSession",
+        _test_data: dict,
+    ):
+        case = _test_data["cases"]["search_order_by_not_allowed"]
+
+        response = await _async_client.post(
+            f"{self.base_url}/heroes/search",
+            json=case["payload"],
+        )
+
+        assert response.status_code == 400
+        assert_response(got=response.json(), want=case["want"])
+
+    @pytest.mark.asyncio
+    async def test_orderable_indexes(
+        self,
+        _async_session: "AsyncSession",
+    ):
+        indexes = await _async_session.scalars(
+            text("SELECT indexname FROM pg_indexes WHERE tablename = :table"),
+            {"table": Hero.__tablename__},
+        )
+
+        assert set(HeroCRUD.orderable.values()) <= set(indexes.all())
+
+    @pytest.mark.asyncio
+    async def test_fast_json(
+        self,
+        _async_client: "AsyncClient",
+        _async_session: "AsyncSession",
+        _heroes: list["Hero"],
+        _test_data: dict,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        payload = _test_data["cases"]["fast_json"]["payload"]
+
+        got = {}
+        for fast_json in (False, True):
+            monkeypatch.setattr(config.app, "fast_json", fast_json)
+            heroes_cache.clear()
+            await heroes_search_cache.clear()
+
+            search = await _async_client.post(
+                f"{self.base_url}/heroes/search",
+                json=payload,
+            )
+            hero = await _async_client.get(
+                f"{self.base_url}/heroes/{_heroes[0].uuid}",
+            )
+
+            assert search.status_code == hero.status_code == 200
+            assert search.headers["content-type"] == "application/json"
+
+            got[fast_json] = (
+                search.json(),
+                hero.json(),
+                hero.headers["ETag"],
+            )
+
+        assert got[True] == got[False]
+
+    @pytest.mark.asyncio
+    async def test_sparse_fields(
+        self,
+        _async_client: "AsyncClient",
+        _async_session: "AsyncSession",
+        _heroes: list["Hero"],
+        _test_data: dict,
+    ):
+        payload = _test_data["cases"]["sparse_fields"]["payload"]
+        want = _test_data["cases"]["sparse_fields"]["want"]
+
+        items, cursor = [], None
+        while True:
+            response = await _async_client.post(
+                f"{self.base_url}/heroes/search",
+                json={**payload, "cursor": cursor},
+            )
+
+            assert response.status_code == 200
+
+            got = response.json()
+            items.extend(got["items"])
+
+            cursor = got["cursor"]
+            if cursor is None:
+                break
+
+        assert {tuple(item) for item in items} == {tuple(payload["fields"])}
+        assert len(items) == got["count"] == want["count"]
+
+        hero = _heroes[0]
+        response = await _async_client.get(
+            f"{self.base_url}/heroes/{hero.uuid}",
+            params={"fields": payload["fields"]},
+        )
+
+        assert response.status_code == 200
+        assert response.headers["ETag"] == f'"{hero.version}"'
+        assert response.json() == {
+            "uuid": str(hero.uuid),
+            "nickname": hero.nickname,
+        }
+
 
 class TestHeroAsStaff:
     """Tests for hero module as staff."""
@@ -274,3 +1197,129 @@ class TestHeroAsStaff:
         hero: Hero | None = results.scalar_one_or_none()
 
         assert hero is None
+
+    @pytest.mark.asyncio
+    async def test_delete_permanently_not_found(
+        self,
+        _async_client_as_staff: "AsyncClient",
+        _test_data: dict,
+    ):
+        case = _test_data["cases"]["delete_not_found"]
+
+        response = await _async_client_as_staff.delete(
+            f"{self.base_url}/heroes/{case['missing']}",
+            params={"permanent": True},
+        )
+
+        assert response.status_code == 404
+        assert_response(got=response.json(), want=case["want"])
+
+    @pytest.mark.asyncio
+    async def test_search_as_staff(
+        self,
+        _async_client_as_staff: "AsyncClient",
+        _async_session: "AsyncSession",
+        _deleted_hero: "Hero",
+        _test_data: dict,
+    ):
+        payload = _test_data["cases"]["search_as_staff"]["payload"]
+
+        response = await _async_client_as_staff.post(
+            f"{self.base_url}/heroes/search",
+            json=payload,
+        )
+
+        assert response.status_code == 200
+
+        got = response.json()
+        want = _test_data["cases"]["search_as_staff"]["want"]
+
+        assert_response(got=got, want=want)
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("format_", ["ndjson", "csv"])
+    async def test_import(
+        self,
+        _async_client_as_staff: "AsyncClient",
+        _async_session: "AsyncSession",
+        _hero: "Hero",
+        _test_data: dict,
+        format_: str,
+    ):
+        case = _test_data["cases"]["import"]
+        heroes, invalid = case["heroes"], case["invalid"][format_]
+        # The existing hero is imported again as the conflicting row
+        conflict = {"nickname": _hero.nickname, "role": heroes[0]["role"]}
+
+        lines = []
+        for row in [heroes[0], conflict, *invalid, *heroes[1:]]:
+            if isinstance(row, str):
+                lines.append(row)
+            elif format_ == "csv":
+                lines.append(f"{row['nickname']},{row['role']}")
+            else:
+                lines.append(json.dumps(row))
+
+        if format_ == "csv":
+            lines.insert(0, "nickname,role")
+            body = "\r\n".join(lines) + "\r\n"
+        else:
+            body = "\n".join(lines)
+
+        response = await _async_client_as_staff.post(
+            f"{self.base_url}/heroes/import",
+            params={"format": format_},
+            content=body.encode(),
+        )
+
+        assert response.status_code == 200
+
+        got = response.json()
+        want = {
+            "rows": len(heroes) + 1 + len(invalid),
+            "imported": len(heroes),
+            "conflicts": 1,
+            "invalid": len(invalid),
+            "errors": [{"line": lines.index(line) + 1} for line in invalid],
+        }
+
+        assert_response(got=got, want=want)
+        assert got["rows_per_second"] > 0
+
+        nicknames = [hero["nickname"] for hero in heroes]
+        statement = select(func.count()).where(Hero.nickname.in_(nicknames))
+
+        assert await _async_session.scalar(statement) == len(heroes)
+
+        statement = select(func.count()).where(
+            Hero.nickname == _hero.nickname,
+        )
+
+        assert await _async_session.scalar(statement) == 1
+
+    @pytest.mark.asyncio
+    async def test_export(
+        self,
+        _async_client_as_staff: "AsyncClient",
+        _async_session: "AsyncSession",
+        _heroes: list["Hero"],
+        _test_data: dict,
+    ):
+        for case in _test_data["cases"]["export"]:
+            response = await _async_client_as_staff.get(
+                f"{self.base_url}/heroes/export",
+                params=case["params"],
+            )
+
+            assert response.status_code == 200
+
+            if case["params"]["format"] == "csv":
+                assert response.headers["content-type"].startswith("text/csv")
+                rows = list(csv.DictReader(io.StringIO(response.text)))
+            else:
+                rows = [json.loads(line) for line in response.iter_lines()]
+
+            assert sorted(row["nickname"] for row in rows) == sorted(
+                case["want"]["nicknames"],
+            )
+            assert set(rows[0]) == set(HeroRetrieve.__fields__)
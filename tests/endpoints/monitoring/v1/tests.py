@@ -0,0 +1,154 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.exc import TimeoutError
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.config import config
+from app.db.postgresql.pool import InstrumentedPool
+
+
+class TestMonitoringAsStaff:
+    """Tests for monitoring module as staff."""
+
+    base_url = "/v1"
+
+    # |Tests|
+    @pytest.mark.asyncio
+    async def test_caches(
+        self,
+        _async_client_as_staff: "AsyncClient",
+    ):
+        response = await _async_client_as_staff.get(
+            f"{self.base_url}/monitoring/caches",
+        )
+
+        assert response.status_code == 200
+
+        got = response.json()
+
+        assert {"size", "hits", "misses", "evictions"} <= set(got["heroes"])
+
+    @pytest.mark.asyncio
+    async def test_flights(
+        self,
+        _async_client_as_staff: "AsyncClient",
+    ):
+        response = await _async_client_as_staff.get(
+            f"{self.base_url}/monitoring/flights",
+        )
+
+        assert response.status_code == 200
+
+        got = response.json()
+
+        assert {"calls", "coalesced", "in_flight"} <= set(got["heroes"])
+
+    @pytest.mark.asyncio
+    async def test_pool(
+        self,
+        _async_client_as_staff: "AsyncClient",
+    ):
+        response = await _async_client_as_staff.get(
+            f"{self.base_url}/monitoring/pool",
+        )
+
+        assert response.status_code == 200
+
+        got = response.json()
+
+        assert {"size", "checked_out", "overflow", "timeouts"} <= set(got)
+        assert "+Inf" in got["waits"]["buckets"]
+
+    @pytest.mark.asyncio
+    async def test_pool_timeouts(self):
+        engine = create_async_engine(
+            config.postgresql.using_async_driver_for_test,
+            poolclass=InstrumentedPool,
+            pool_size=1,
+            max_overflow=0,
+            pool_timeout=0.1,
+        )
+
+        async with engine.connect():
+            with pytest.raises(TimeoutError):
+                async with engine.connect():
+                    pass
+
+        stats = engine.pool.stats()
+        await engine.dispose()
+
+        assert stats["timeouts"] == 1
+        assert stats["waits"]["count"] == 2
+        assert stats["waits"]["sum"] >= 0.1
+
+    @pytest.mark.asyncio
+    async def test_replicas(
+        self,
+        _async_client_as_staff: "AsyncClient",
+    ):
+        response = await _async_client_as_staff.get(
+            f"{self.base_url}/monitoring/replicas",
+        )
+
+        assert response.status_code == 200
+        assert {"failovers", "replicas"} <= set(response.json())
+
+    @pytest.mark.asyncio
+    async def test_compiled_cache(
+        self,
+        _async_client_as_staff: "AsyncClient",
+    ):
+        # Distinct limits miss the search cache, not the compiled one
+        for limit in range(1, 5):
+            response = await _async_client_as_staff.post(
+                f"{self.base_url}/heroes/search",
+                json={
+                    "limit": limit,
+                    "order_by": [{"field": "nickname", "desc": limit % 2}],
+                },
+            )
+
+            assert response.status_code == 200
+
+        response = await _async_client_as_staff.get(
+            f"{self.base_url}/monitoring/compiled-cache",
+        )
+
+        assert response.status_code == 200
+
+        got = response.json()["hrs_heroes"]
+
+        assert got["hits"] >= 2
+        assert 0 < got["hit_rate"] <= 1
+
+    @pytest.mark.asyncio
+    async def test_metrics(
+        self,
+        _async_client_as_staff: "AsyncClient",
+    ):
+        response = await _async_client_as_staff.post(
+            f"{self.base_url}/heroes/search",
+            json={"order_by": [{"field": "nickname", "desc": True}]},
+        )
+
+        assert response.status_code == 200
+
+        # The client base url has the admin prefix, metrics have none
+        response = await _async_client_as_staff.get("http://test/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+
+        got = response.text
+
+        assert "# TYPE http_request_duration_seconds histogram" in got
+        assert (
+            'http_request_duration_seconds_count{method="POST",'
+            f'route="{config.prefixes.admin}{self.base_url}/heroes/search",'
+            'status="200"}'
+        ) in got
+        assert 'http_requests_in_flight{method="GET"} 1.0' in got
+        assert (
+            'db_statement_duration_seconds_bucket{op="select_with_count",'
+            'table="hrs_heroes",le="+Inf"}'
+        ) in got
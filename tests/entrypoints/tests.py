@@ -0,0 +1,119 @@
+import os
+import subprocess
+import sys
+from contextlib import AsyncExitStack
+from typing import TYPE_CHECKING
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from app.config import config
+from app.db.postgresql.base import Database
+from app.entrypoints import main
+
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncConnection
+
+
+# Seconds a fresh interpreter may spend importing the app, generous by
+# default since timings of shared runners vary a lot.
+IMPORT_BUDGET = float(os.getenv("TEST_IMPORT_BUDGET", 5.0))
+
+
+@pytest.fixture
+def _database(
+    _db_connection: "AsyncConnection",
+    monkeypatch: pytest.MonkeyPatch,
+) -> Database:
+    # Tables are there as long as the test connection is
+    database = Database(
+        settings=config.postgresql.copy(
+            update={
+                "dsn": config.postgresql.using_async_driver_for_test,
+                "pool_size": 3,
+            },
+        ),
+    )
+    monkeypatch.setattr(main, "database", database)
+
+    return database
+
+
+class TestStartup:
+    """Tests for app startup & shutdown."""
+
+    # |Tests|
+    def test_import_time(self):
+        # Importing the app must neither connect nor load the driver
+        code = (
+            "import sys, time\n"
+            "started = time.perf_counter()\n"
+            "from app.entrypoints.main import create_app, database\n"
+            "print(time.perf_counter() - started)\n"
+            "print(database._engine is None)\n"
+            "print('asyncpg' in sys.modules)\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            capture_output=True,
+            check=True,
+            text=True,
+        )
+        seconds, lazy, driver = result.stdout.split()
+
+        assert lazy == "True"
+        assert driver == "False"
+        assert float(seconds) < IMPORT_BUDGET
+
+    @pytest.mark.asyncio
+    async def test_warm_startup(
+        self,
+        _database: Database,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        monkeypatch.setattr(config.postgresql, "warm_connections", 5)
+
+        async with main.lifespan(FastAPI()):
+            stats = _database.engine.pool.stats()
+
+            # Connections are checked out at once to look into each one
+            prepared = []
+            async with AsyncExitStack() as stack:
+                for _ in range(stats["size"]):
+                    conn = await stack.enter_async_context(
+                        _database.engine.connect(),
+                    )
+                    prepared.append(
+                        await conn.scalar(
+                            text(
+                                "SELECT count(*) FROM pg_prepared_statements "
+                                "WHERE statement LIKE '%FROM hrs_heroes%' "
+                                "AND statement NOT LIKE '%pg_prepared%'",
+                            ),
+                        ),
+                    )
+
+        # No more connections than the pool keeps are opened
+        assert stats["size"] == 3
+        assert stats["checked_in"] == 3
+        # Lookups by id, of versions & of many heroes, public and staff
+        assert prepared == [6, 6, 6]
+        assert _database._engine is None
+
+    def test_lifespan(
+        self,
+        _database: Database,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        monkeypatch.setattr(config.postgresql, "warm_connections", 2)
+
+        with TestClient(main.create_app()) as client:
+            response = client.get("/health_check")
+
+            assert response.status_code == 200
+            assert _database.engine.pool.stats()["checked_in"] == 2
+
+        assert _database._engine is None
@@ -2,6 +2,7 @@ import pytest_asyncio
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.modules.heroes.crud.models import Hero
+from app.modules.heroes.services.cache import heroes_cache, heroes_search_cache
 from tests.factory import Factory
 
 
@@ -22,3 +23,9 @@ async def _heroes(_async_session: AsyncSession, _test_data: dict):
 async def _hero(_async_session: AsyncSession, _test_data: dict):
     factory = HeroFactory(async_session=_async_session, data=_test_data)
     return await factory.populate_data(many=False)
+
+
+@pytest_asyncio.fixture(autouse=True)
+async def _heroes_caches():
+    heroes_cache.clear()
+    await heroes_search_cache.clear()
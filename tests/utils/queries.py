@@ -0,0 +1,42 @@
+from contextlib import contextmanager
+from typing import Iterator
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+@contextmanager
+def count_queries(session: AsyncSession) -> Iterator[list[str]]:
+    """Collects statements executed through the connection of a session."""
+
+    statements = []
+    connection = session.bind.sync_connection
+
+    def before_cursor_execute(conn, cursor, statement, *args):  # noqa
+        statements.append(statement)
+
+    event.listen(connection, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(
+            connection,
+            "before_cursor_execute",
+            before_cursor_execute,
+        )
+
+
+@contextmanager
+def assert_max_queries(
+    session: AsyncSession,
+    max_queries: int,
+) -> Iterator[list[str]]:
+    """Fails if more than `max_queries` statements have been executed."""
+
+    with count_queries(session) as statements:
+        yield statements
+
+    assert len(statements) <= max_queries, (
+        f"{len(statements)} statements executed, {max_queries} expected "
+        "at most:\n" + "\n".join(statements)
+    )